@@ -145,7 +145,7 @@ run_agent() {
         else
             # Fallback: install minimal packages
             echo -e "${YELLOW}📦 Installing required Python packages...${NC}"
-            pip install -q requests pyyaml redis flask gitpython anthropic
+            pip install -q requests pyyaml redis flask gitpython anthropic zstandard
         fi
     fi
 
@@ -120,7 +120,16 @@ class AIAgentClient:
         )
         response.raise_for_status()
         data = response.json()
-        return data['agent_id'], data['config']
+
+        # Older orchestrators send the config inline
+        config = data.get('config') or self.fetch_config()
+        return data['agent_id'], config
+
+    def fetch_config(self):
+        """Fetch orchestrator config"""
+        response = requests.get(f"{self.orchestrator_url}/config", timeout=10)
+        response.raise_for_status()
+        return response.json()
 
     def claim_task(self):
         """Claim next available task"""
@@ -1869,10 +1878,10 @@ The agent will automatically detect your commit and continue.
             redis_host = self.config['redis']['host']
             redis_port = self.config['redis']['port']
 
+            # Raw bytes: large notifications arrive zstd-compressed
             self.redis_client = redis.Redis(
                 host=redis_host,
-                port=redis_port,
-                decode_responses=True
+                port=redis_port
             )
 
             # Test connection
@@ -1906,7 +1915,7 @@ The agent will automatically detect your commit and continue.
             for message in pubsub.listen():
                 if message['type'] == 'message':
                     try:
-                        notification = json.loads(message['data'])
+                        notification = self.decode_notification(message['data'])
                         self.handle_notification(notification)
                     except Exception as e:
                         print(f"⚠️  Failed to handle notification: {e}")
@@ -1914,6 +1923,13 @@ The agent will automatically detect your commit and continue.
         except Exception as e:
             print(f"⚠️  Notification listener error: {e}")
 
+    def decode_notification(self, payload):
+        """Decode a notification: JSON, or b'Z' + zstd-compressed JSON"""
+        if payload[:1] == b'Z':
+            import zstandard
+            payload = zstandard.ZstdDecompressor().decompress(payload[1:])
+        return json.loads(payload)
+
     def handle_notification(self, notification):
         """Handle notification from merge coordinator"""
         event_type = notification['event_type']
@@ -0,0 +1,36 @@
+"""
+Gunicorn configuration for the Orchestrator API
+
+gevent workers make socket I/O cooperative, so requests waiting on Redis
+overlap instead of each pinning an OS thread.
+
+Usage (from project root):
+    gunicorn -c tools/orchestrator/gunicorn.conf.py main:app
+"""
+
+# Patch before main is imported in the arbiter (when_ready) so workers
+# inherit cooperative sockets instead of patching after the fact
+from gevent import monkey
+monkey.patch_all()
+
+import os
+import multiprocessing
+
+chdir = os.path.dirname(os.path.abspath(__file__))
+bind = f"0.0.0.0:{os.getenv('ORCHESTRATOR_PORT', '8765')}"
+worker_class = "gevent"
+workers = int(os.getenv('ORCHESTRATOR_WORKERS', multiprocessing.cpu_count()))
+worker_connections = 1000
+timeout = 60
+
+
+def when_ready(server):
+    """Initialize orchestrator once, before any worker is forked"""
+    from main import bootstrap
+    bootstrap()
+
+
+def post_worker_init(worker):
+    """Attach merge coordinator and contend for the background services lease"""
+    from main import start_background_services
+    start_background_services()
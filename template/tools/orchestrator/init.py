@@ -13,6 +13,12 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Dependency index keys (see build_ready_index)
+PENDING_DEPS_KEY = "task:{}:pending_deps"
+BLOCKS_KEY = "task:{}:blocks"
+READY_KEY = "orchestrator:ready:{}"
+TASK_PHASES_KEY = "orchestrator:task_phases"
+
 
 def detect_project_type(project_root="/app"):
     """
@@ -146,6 +152,27 @@ def validate_backlog_tasks(tasks):
     logger.info(f"✅ Backlog validation passed ({len(tasks)} tasks)")
 
 
+def enable_keyspace_events(redis_client, flags):
+    """
+    Make sure Redis publishes the given keyspace notification classes
+
+    Merges with the flags already configured. Managed Redis services may
+    reject CONFIG SET; then notify-keyspace-events must be set server-side.
+    """
+    def is_missing(flag, current):
+        # 'A' is an alias for all event classes
+        return flag not in current and not (flag in 'g$lshzxetmd' and 'A' in current)
+
+    try:
+        current = redis_client.config_get('notify-keyspace-events').get('notify-keyspace-events', '')
+        missing = ''.join(flag for flag in flags if is_missing(flag, current))
+        if missing:
+            redis_client.config_set('notify-keyspace-events', current + missing)
+            logger.info(f"✅ Enabled keyspace notifications: {current + missing}")
+    except Exception as e:
+        logger.warning(f"⚠️  Could not enable keyspace notifications ({flags}): {e}")
+
+
 def recover_stuck_tasks(redis_client, config):
     """
     Recover stuck tasks from previous sessions (Fix #23)
@@ -160,6 +187,7 @@ def recover_stuck_tasks(redis_client, config):
 
     tasks_key = "orchestrator:tasks"
     agents_key = "orchestrator:agents"
+    heartbeats_key = "orchestrator:heartbeats"
     agent_timeout = config['redis'].get('agent_timeout', 300)
     retry_failed = config['advanced'].get('retry_failed_tasks', True)
 
@@ -170,11 +198,13 @@ def recover_stuck_tasks(redis_client, config):
 
     # Get all active agents
     active_agents = set()
+    heartbeats = redis_client.hgetall(heartbeats_key)
     for agent_id in redis_client.hkeys(agents_key):
         agent_data_str = redis_client.hget(agents_key, agent_id)
         if agent_data_str:
             agent_data = json.loads(agent_data_str)
-            last_heartbeat = datetime.fromisoformat(agent_data.get('last_heartbeat', '2000-01-01'))
+            last_heartbeat_str = heartbeats.get(agent_id) or agent_data.get('last_heartbeat', '2000-01-01')
+            last_heartbeat = datetime.fromisoformat(last_heartbeat_str)
             time_since_heartbeat = (datetime.now() - last_heartbeat).total_seconds()
 
             if time_since_heartbeat < agent_timeout:
@@ -199,6 +229,7 @@ def recover_stuck_tasks(redis_client, config):
             if 'completed_at' in task:
                 del task['completed_at']
             redis_client.hset(tasks_key, task_id, json.dumps(task))
+            requeue_task(redis_client, task_id)
             recovered_count += 1
 
         # Case 2: Failed but retry is enabled
@@ -214,6 +245,7 @@ def recover_stuck_tasks(redis_client, config):
             if 'error' in task:
                 del task['error']
             redis_client.hset(tasks_key, task_id, json.dumps(task))
+            requeue_task(redis_client, task_id)
             recovered_count += 1
 
     if recovered_count > 0:
@@ -306,6 +338,9 @@ def initialize_orchestrator(redis_client, config):
     # Store phases in Redis
     redis_client.set("orchestrator:phases", json.dumps(phases))
 
+    # Precompute dependency counters and ready queues
+    build_ready_index(redis_client, tasks, phases)
+
     # Set first phase as active
     if phases:
         first_phase = phases[0]
@@ -320,6 +355,77 @@ def initialize_orchestrator(redis_client, config):
     logger.info("✅ Orchestrator initialization complete")
 
 
+def build_ready_index(redis_client, tasks, phases):
+    """
+    Precompute dependency counters and per-phase ready queues
+
+    task:<id>:pending_deps counts dependencies not merged yet, and
+    task:<id>:blocks holds the tasks waiting on <id>. A task is claimable
+    once its counter is 0; it then sits in orchestrator:ready:<phase>.
+    Dependency work is paid once per merge (release_dependents) instead
+    of on every claim. Rebuilt from current statuses on every start.
+    """
+    statuses = {
+        task_id: json.loads(task_json).get('status')
+        for task_id, task_json in redis_client.hgetall("orchestrator:tasks").items()
+    }
+
+    pipe = redis_client.pipeline(transaction=False)
+
+    # Drop index left over from a previous run
+    for key in redis_client.scan_iter(READY_KEY.format('*')):
+        pipe.delete(key)
+    pipe.delete(TASK_PHASES_KEY)
+
+    pending_deps = {}
+    for task in tasks:
+        task_id = task['id']
+        pending_deps[task_id] = sum(
+            1 for dep_id in task.get('dependencies', [])
+            if statuses.get(dep_id) != 'merged'
+        )
+        pipe.set(PENDING_DEPS_KEY.format(task_id), pending_deps[task_id])
+        pipe.delete(BLOCKS_KEY.format(task_id))
+
+    for task in tasks:
+        for dep_id in task.get('dependencies', []):
+            pipe.sadd(BLOCKS_KEY.format(dep_id), task['id'])
+
+    # Queue ready tasks in phase order
+    for phase in phases:
+        for task_id in phase['tasks']:
+            pipe.hset(TASK_PHASES_KEY, task_id, phase['id'])
+            if statuses.get(task_id) == 'pending' and pending_deps[task_id] == 0:
+                pipe.rpush(READY_KEY.format(phase['id']), task_id)
+
+    pipe.execute()
+
+
+def requeue_task(redis_client, task_id):
+    """Put a task that went back to pending on its phase's ready queue"""
+    pending_deps = redis_client.get(PENDING_DEPS_KEY.format(task_id))
+    phase_id = redis_client.hget(TASK_PHASES_KEY, task_id)
+    if phase_id and int(pending_deps or 0) == 0:
+        redis_client.rpush(READY_KEY.format(phase_id), task_id)
+
+
+def release_dependents(redis_client, task_id):
+    """
+    Count a merged task off its dependents
+
+    Dependents whose last pending dependency this was become ready.
+    DECR is atomic, so exactly one merge queues each dependent.
+
+    Returns: List of task IDs that became ready
+    """
+    ready = []
+    for dependent_id in redis_client.smembers(BLOCKS_KEY.format(task_id)):
+        if redis_client.decr(PENDING_DEPS_KEY.format(dependent_id)) == 0:
+            requeue_task(redis_client, dependent_id)
+            ready.append(dependent_id)
+    return ready
+
+
 def calculate_phases(tasks):
     """
     Calculate execution phases using dependency graph
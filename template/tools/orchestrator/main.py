@@ -8,16 +8,18 @@ Handles task distribution, phase management, and Git workflow.
 
 import os
 import sys
-import json
+import hashlib
 import yaml
+import orjson
 import redis
 import logging
 import time
 from datetime import datetime
-from threading import Thread
-from flask import Flask, request, jsonify
+from threading import Thread, Lock, Event
+from flask import Flask, request
 from pathlib import Path
 from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+from init import READY_KEY, BLOCKS_KEY, requeue_task
 
 # Setup logging
 logging.basicConfig(
@@ -28,11 +30,40 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+
+# JSON helpers: orjson encodes straight to bytes in C. Redis is opened with
+# decode_responses=True, so values written there are decoded back to str.
+def _dumps(obj):
+    return orjson.dumps(obj).decode()
+
+
+_loads = orjson.loads
+
+
+def json_response(payload):
+    """Build a JSON response without going through Flask's jsonify"""
+    return app.response_class(orjson.dumps(payload), mimetype='application/json')
+
 # Load configuration
 CONFIG_PATH = os.getenv('CONFIG_PATH', '/app/orchestrator-config.yaml')
 with open(CONFIG_PATH, 'r') as f:
     CONFIG = yaml.safe_load(f)
 
+# Pre-serialized config served by /config; agents re-fetch only when the
+# etag they got from /agent/register changes
+CONFIG_JSON_BYTES = b""
+CONFIG_ETAG = ""
+
+
+def refresh_config_cache():
+    """Re-serialize CONFIG (initialization adds project-specific checks)"""
+    global CONFIG_JSON_BYTES, CONFIG_ETAG
+    CONFIG_JSON_BYTES = orjson.dumps(CONFIG)
+    CONFIG_ETAG = hashlib.sha256(CONFIG_JSON_BYTES).hexdigest()[:16]
+
+
+refresh_config_cache()
+
 
 # Fix #10: Redis connection with retry logic
 def create_redis_connection(max_retries=5):
@@ -40,17 +71,24 @@ def create_redis_connection(max_retries=5):
     redis_host = os.getenv('REDIS_HOST', CONFIG['redis']['host'])
     redis_port = int(os.getenv('REDIS_PORT', CONFIG['redis']['port']))
     redis_db = CONFIG['redis']['db']
+    max_connections = CONFIG['redis'].get('max_connections', 100)
 
     for attempt in range(max_retries):
         try:
-            r = redis.Redis(
+            # Bounded shared pool: under gevent, hundreds of in-flight requests
+            # multiplex over these connections and wait cooperatively for a
+            # free one instead of each opening its own socket
+            pool = redis.BlockingConnectionPool(
                 host=redis_host,
                 port=redis_port,
                 db=redis_db,
                 decode_responses=True,
                 socket_connect_timeout=5,
-                socket_timeout=5
+                socket_timeout=5,
+                max_connections=max_connections,
+                timeout=5
             )
+            r = redis.Redis(connection_pool=pool)
             # Test connection
             r.ping()
             logger.info(f"✅ Connected to Redis at {redis_host}:{redis_port}")
@@ -80,6 +118,77 @@ PHASE_KEY = "orchestrator:current_phase"
 PHASES_KEY = "orchestrator:phases"
 CONFIG_KEY = "orchestrator:config"
 STATS_KEY = "orchestrator:stats"
+HEARTBEATS_KEY = "orchestrator:heartbeats"
+ALIVE_KEY = "agent:{}:alive"  # expires agent_timeout after the last heartbeat
+EVENTS_KEY = "orchestrator:events"  # task state transitions (Redis Stream)
+EVENTS_MAXLEN = 10000
+AGENT_SEQ_KEY = "orchestrator:agent_seq"
+
+# Allocate the next agent ID atomically (INCR never hands out the same
+# number twice, even after unregisters/restarts) and store the agent
+# record. The liveness key depends on the ID, so the caller sets it.
+REGISTER_AGENT_LUA = """
+local agent_id
+repeat
+    agent_id = 'ai-agent-' .. redis.call('INCR', KEYS[1])
+until redis.call('HEXISTS', KEYS[2], agent_id) == 0
+local agent_info = cjson.decode(ARGV[1])
+agent_info['agent_id'] = agent_id
+redis.call('HSET', KEYS[2], agent_id, cjson.encode(agent_info))
+return agent_id
+"""
+register_agent_script = r.register_script(REGISTER_AGENT_LUA)
+
+# Claim the task at the head of a phase's ready queue (ARGV[1], peeked by
+# the caller so the lock key can be declared). Pop, status check, lock and
+# both status updates happen atomically: a failed claim leaves the queue
+# untouched instead of losing the task. Returns {'claimed', task, role},
+# {'locked'} (lock still held; rotated to the back), {'skip'} (stale or
+# disabled entry, dropped) or {'retry'} (head changed meanwhile).
+CLAIM_TASK_LUA = """
+if cjson.decode_array_with_array_mt then
+    cjson.decode_array_with_array_mt(true)  -- keep [] as [] on re-encode
+end
+if redis.call('LINDEX', KEYS[1], 0) ~= ARGV[1] then
+    return {'retry'}
+end
+local task_json = redis.call('HGET', KEYS[2], ARGV[1])
+local task = task_json and cjson.decode(task_json)
+local disabled = cjson.decode(ARGV[5])
+if not task or task['status'] ~= 'pending' or disabled[task['type'] or 'development'] then
+    redis.call('LPOP', KEYS[1])
+    return {'skip'}
+end
+if not redis.call('SET', KEYS[3], ARGV[2], 'NX', 'EX', ARGV[3]) then
+    redis.call('RPUSH', KEYS[1], redis.call('LPOP', KEYS[1]))
+    return {'locked'}
+end
+redis.call('LPOP', KEYS[1])
+
+task['status'] = 'in_progress'
+task['assigned_to'] = ARGV[2]
+task['started_at'] = ARGV[4]
+task_json = cjson.encode(task)
+redis.call('HSET', KEYS[2], ARGV[1], task_json)
+
+local role = cjson.decode(ARGV[6])[task['type']] or 'developer'
+local agent_json = redis.call('HGET', KEYS[4], ARGV[2])
+if agent_json then
+    local agent = cjson.decode(agent_json)
+    agent['status'] = 'working'
+    agent['current_task'] = ARGV[1]
+    agent['current_role'] = role
+    redis.call('HSET', KEYS[4], ARGV[2], cjson.encode(agent))
+end
+return {'claimed', task_json, role}
+"""
+claim_task_script = r.register_script(CLAIM_TASK_LUA)
+
+# Heartbeats are buffered in-process and flushed to Redis in one pipeline
+# per second; they only need to land well within agent_timeout
+PENDING_HEARTBEATS = {}
+pending_heartbeats_lock = Lock()
+HEARTBEAT_FLUSH_INTERVAL = 1  # seconds
 
 
 @app.route('/health', methods=['GET'])
@@ -87,13 +196,13 @@ def health():
     """Health check endpoint"""
     try:
         r.ping()
-        return jsonify({
+        return json_response({
             "status": "healthy",
             "redis": "connected",
             "timestamp": datetime.now().isoformat()
         })
     except Exception as e:
-        return jsonify({
+        return json_response({
             "status": "unhealthy",
             "error": str(e)
         }), 500
@@ -121,13 +230,13 @@ def cleanup_stuck_tasks():
         logger.info("🧹 Manual cleanup requested via API")
         recovered_count = recover_stuck_tasks(r, CONFIG)
 
-        return jsonify({
+        return json_response({
             "recovered": recovered_count,
             "message": "Cleanup completed successfully"
         })
     except Exception as e:
         logger.error(f"❌ Cleanup failed: {e}")
-        return jsonify({
+        return json_response({
             "error": str(e),
             "message": "Cleanup failed"
         }), 500
@@ -146,22 +255,19 @@ def register_agent():
     Response:
         {
             "agent_id": "ai-agent-1",
-            "config": {...}
+            "config_etag": "3f2a9c0d1b7e4a56"
         }
+
+    Fetch the config itself from GET /config.
     """
     data = request.json
     session_id = data.get('session_id')
 
     if not session_id:
-        return jsonify({"error": "session_id required"}), 400
-
-    # Generate unique agent ID
-    agent_count = r.hlen(AGENTS_KEY)
-    agent_id = f"ai-agent-{agent_count + 1}"
+        return json_response({"error": "session_id required"}), 400
 
-    # Store agent info
+    # Agent info (agent_id is filled in by the register script)
     agent_info = {
-        "agent_id": agent_id,
         "session_id": session_id,
         "status": "idle",
         "current_task": None,
@@ -172,17 +278,37 @@ def register_agent():
         "tasks_failed": 0
     }
 
-    r.hset(AGENTS_KEY, agent_id, json.dumps(agent_info))
+    agent_id = register_agent_script(
+        keys=[AGENT_SEQ_KEY, AGENTS_KEY],
+        args=[_dumps(agent_info)]
+    )
+    r.set(ALIVE_KEY.format(agent_id), 1, ex=CONFIG['redis']['agent_timeout'])
 
     logger.info(f"✅ Agent registered: {agent_id} (session: {session_id})")
 
-    # Return agent config
-    return jsonify({
+    return json_response({
         "agent_id": agent_id,
-        "config": CONFIG
+        "config_etag": CONFIG_ETAG
     })
 
 
+@app.route('/config', methods=['GET'])
+def get_config():
+    """
+    Orchestrator config
+
+    Query: ?etag=<config_etag> (or If-None-Match header)
+    Responds 304 with no body when the caller's copy is current.
+    """
+    etag = request.args.get('etag') or request.headers.get('If-None-Match', '').strip('"')
+    if etag == CONFIG_ETAG:
+        return app.response_class(status=304, headers={'ETag': f'"{CONFIG_ETAG}"'})
+
+    response = app.response_class(CONFIG_JSON_BYTES, mimetype='application/json')
+    response.headers['ETag'] = f'"{CONFIG_ETAG}"'
+    return response
+
+
 @app.route('/task/claim', methods=['POST'])
 def claim_task():
     """
@@ -214,14 +340,19 @@ def claim_task():
     agent_id = data.get('agent_id')
 
     if not agent_id:
-        return jsonify({"error": "agent_id required"}), 400
+        return json_response({"error": "agent_id required"}), 400
 
     # Check if agent exists
-    agent_json = r.hget(AGENTS_KEY, agent_id)
-    if not agent_json:
-        return jsonify({"error": "Agent not registered"}), 404
+    if not r.hexists(AGENTS_KEY, agent_id):
+        return json_response({"error": "Agent not registered"}), 404
+
+    disabled_types = _dumps({
+        task_type: True
+        for task_type, settings in CONFIG['agent_assignment'].items()
+        if isinstance(settings, dict) and not settings.get('enabled', True)
+    })
 
-    # Use Redis transaction for atomic claim
+    # Claim atomically (see CLAIM_TASK_LUA)
     max_attempts = 10
     for attempt in range(max_attempts):
         try:
@@ -229,62 +360,55 @@ def claim_task():
             current_phase = get_current_phase()
 
             if not current_phase:
-                return jsonify({
+                return json_response({
                     "task": None,
                     "reason": "no_active_phase"
                 })
 
-            # Find next available task in current phase
-            task = find_next_available_task(current_phase, agent_id)
+            # Next ready task (all dependencies merged) in current phase
+            ready_key = READY_KEY.format(current_phase['id'])
+            task_id = r.lindex(ready_key, 0)
 
-            if not task:
-                return jsonify({
+            if not task_id:
+                return json_response({
                     "task": None,
                     "reason": "no_tasks_available",
                     "phase": current_phase['id']
                 })
 
-            # Atomic claim using Redis SET NX (set if not exists)
-            task_lock_key = f"task_lock:{task['id']}"
-            lock_acquired = r.set(
-                task_lock_key,
-                agent_id,
-                nx=True,
-                ex=CONFIG['redis']['task_lock_ttl']
+            result = claim_task_script(
+                keys=[ready_key, TASKS_KEY, f"task_lock:{task_id}", AGENTS_KEY],
+                args=[
+                    task_id,
+                    agent_id,
+                    CONFIG['redis']['task_lock_ttl'],
+                    datetime.now().isoformat(),
+                    disabled_types,
+                    ROLE_MAPPING_JSON
+                ]
             )
-
-            if not lock_acquired:
-                # Another agent claimed this task, retry
+            if result[0] != 'claimed':
+                # Stale/disabled entry dropped, lock still held, or another
+                # agent claimed it first: try the next one
                 continue
 
-            # Update task status
-            task['status'] = 'in_progress'
-            task['assigned_to'] = agent_id
-            task['started_at'] = datetime.now().isoformat()
-            r.hset(TASKS_KEY, task['id'], json.dumps(task))
-
-            # Determine role for this task
-            role = determine_role(task['type'])
+            task = _loads(result[1])
+            role = result[2]
 
-            # Update agent status
-            agent_info = json.loads(agent_json)
-            agent_info['status'] = 'working'
-            agent_info['current_task'] = task['id']
-            agent_info['current_role'] = role
-            r.hset(AGENTS_KEY, agent_id, json.dumps(agent_info))
+            record_event('claimed', task_id=task['id'], agent=agent_id, role=role)
 
             logger.info(f"🎯 Task {task['id']} claimed by {agent_id} (role: {role})")
 
-            return jsonify({"task": task, "role": role})
+            return json_response({"task": task, "role": role})
 
         except Exception as e:
             logger.error(f"Error claiming task: {e}")
             if attempt == max_attempts - 1:
-                return jsonify({"error": str(e)}), 500
+                return json_response({"error": str(e)}), 500
             continue
 
     # Failed to claim after max attempts
-    return jsonify({
+    return json_response({
         "task": None,
         "reason": "claim_failed_max_attempts"
     })
@@ -312,21 +436,25 @@ def complete_task():
     branch_name = data.get('branch_name')
 
     if not agent_id or not task_id:
-        return jsonify({"error": "agent_id and task_id required"}), 400
+        return json_response({"error": "agent_id and task_id required"}), 400
 
     # Update task
     task_json = r.hget(TASKS_KEY, task_id)
     if not task_json:
-        return jsonify({"error": "Task not found"}), 404
+        return json_response({"error": "Task not found"}), 404
 
-    task = json.loads(task_json)
+    task = _loads(task_json)
     task['status'] = 'done' if success else 'failed'
     task['completed_at'] = datetime.now().isoformat()
     if pr_url:
         task['pr_url'] = pr_url
     if branch_name:
         task['branch_name'] = branch_name
-    r.hset(TASKS_KEY, task_id, json.dumps(task))
+    r.hset(TASKS_KEY, task_id, _dumps(task))
+
+    # Fix #17: Tasks depending on a failed task can never run
+    if not success:
+        block_dependents(task_id)
 
     # Release task lock
     r.delete(f"task_lock:{task_id}")
@@ -334,7 +462,7 @@ def complete_task():
     # Update agent
     agent_json = r.hget(AGENTS_KEY, agent_id)
     if agent_json:
-        agent_info = json.loads(agent_json)
+        agent_info = _loads(agent_json)
         agent_info['status'] = 'idle'
         agent_info['current_task'] = None
         agent_info['current_role'] = None
@@ -342,7 +470,15 @@ def complete_task():
             agent_info['tasks_completed'] = agent_info.get('tasks_completed', 0) + 1
         else:
             agent_info['tasks_failed'] = agent_info.get('tasks_failed', 0) + 1
-        r.hset(AGENTS_KEY, agent_id, json.dumps(agent_info))
+        r.hset(AGENTS_KEY, agent_id, _dumps(agent_info))
+
+    record_event(
+        'complete' if success else 'failed',
+        task_id=task_id,
+        agent=agent_id,
+        pr_url=pr_url,
+        branch=branch_name
+    )
 
     status_icon = "✅" if success else "❌"
     logger.info(f"{status_icon} Task {task_id} completed by {agent_id} (success: {success})")
@@ -356,7 +492,7 @@ def complete_task():
 
     # Note: Phase advancement happens after successful merge, not here
 
-    return jsonify({"success": True})
+    return json_response({"success": True})
 
 
 @app.route('/agent/heartbeat', methods=['POST'])
@@ -364,6 +500,8 @@ def heartbeat():
     """
     Agent heartbeat to indicate it's still alive
 
+    Buffered in-process; heartbeat_flush_service writes it to Redis.
+
     Request:
         {
             "agent_id": "ai-agent-1"
@@ -373,17 +511,12 @@ def heartbeat():
     agent_id = data.get('agent_id')
 
     if not agent_id:
-        return jsonify({"error": "agent_id required"}), 400
-
-    agent_json = r.hget(AGENTS_KEY, agent_id)
-    if not agent_json:
-        return jsonify({"error": "Agent not found"}), 404
+        return json_response({"error": "agent_id required"}), 400
 
-    agent_info = json.loads(agent_json)
-    agent_info['last_heartbeat'] = datetime.now().isoformat()
-    r.hset(AGENTS_KEY, agent_id, json.dumps(agent_info))
+    with pending_heartbeats_lock:
+        PENDING_HEARTBEATS[agent_id] = datetime.now().isoformat()
 
-    return jsonify({"success": True})
+    return json_response({"success": True})
 
 
 @app.route('/agent/unregister', methods=['POST'])
@@ -393,12 +526,12 @@ def unregister_agent():
     agent_id = data.get('agent_id')
 
     if not agent_id:
-        return jsonify({"error": "agent_id required"}), 400
+        return json_response({"error": "agent_id required"}), 400
 
     # Release any locked tasks
     agent_json = r.hget(AGENTS_KEY, agent_id)
     if agent_json:
-        agent_info = json.loads(agent_json)
+        agent_info = _loads(agent_json)
         if agent_info.get('current_task'):
             task_lock_key = f"task_lock:{agent_info['current_task']}"
             r.delete(task_lock_key)
@@ -406,17 +539,20 @@ def unregister_agent():
             # Reset task status
             task_json = r.hget(TASKS_KEY, agent_info['current_task'])
             if task_json:
-                task = json.loads(task_json)
+                task = _loads(task_json)
                 task['status'] = 'pending'
                 task['assigned_to'] = None
-                r.hset(TASKS_KEY, agent_info['current_task'], json.dumps(task))
+                r.hset(TASKS_KEY, agent_info['current_task'], _dumps(task))
+                requeue_task(r, agent_info['current_task'])
 
     # Remove agent
     r.hdel(AGENTS_KEY, agent_id)
+    r.hdel(HEARTBEATS_KEY, agent_id)
+    r.delete(ALIVE_KEY.format(agent_id))
 
     logger.info(f"👋 Agent unregistered: {agent_id}")
 
-    return jsonify({"success": True})
+    return json_response({"success": True})
 
 
 @app.route('/status', methods=['GET'])
@@ -424,20 +560,29 @@ def get_status():
     """Get orchestrator status"""
     # Get all agents
     agents = {}
+    heartbeats = r.hgetall(HEARTBEATS_KEY)
     for agent_id, agent_json in r.hgetall(AGENTS_KEY).items():
-        agents[agent_id] = json.loads(agent_json)
+        agent = _loads(agent_json)
+        agent['last_heartbeat'] = heartbeats.get(agent_id, agent.get('last_heartbeat'))
+        agents[agent_id] = agent
 
     # Get all tasks
     tasks = {}
     for task_id, task_json in r.hgetall(TASKS_KEY).items():
-        tasks[task_id] = json.loads(task_json)
+        tasks[task_id] = _loads(task_json)
 
     # Get current phase
     current_phase = get_current_phase()
 
     # Get all phases
     phases_json = r.get(PHASES_KEY)
-    phases = json.loads(phases_json) if phases_json else []
+    phases = _loads(phases_json) if phases_json else []
+
+    # Recent activity, newest first
+    recent_events = [
+        {"id": event_id, **fields}
+        for event_id, fields in r.xrevrange(EVENTS_KEY, count=50)
+    ]
 
     # Calculate stats
     stats = {
@@ -453,11 +598,12 @@ def get_status():
         "total_phases": len(phases)
     }
 
-    return jsonify({
+    return json_response({
         "agents": agents,
         "tasks": tasks,
         "phases": phases,
         "current_phase": current_phase,
+        "recent_events": recent_events,
         "stats": stats,
         "config": CONFIG
     })
@@ -465,215 +611,301 @@ def get_status():
 
 # Helper functions
 
+# Task type -> agent role
+_ROLE_MAPPING = {
+    'setup': 'setup-specialist',
+    'development': 'developer',
+    'testing': 'tester',
+    'security': 'security-auditor',
+    'documentation': 'technical-writer',
+    'review': 'code-reviewer'
+}
+
+# Passed to CLAIM_TASK_LUA, which picks the role (default 'developer')
+ROLE_MAPPING_JSON = _dumps(_ROLE_MAPPING)
+
+
+def record_event(event_type, **fields):
+    """Append a task state transition to the orchestrator:events stream"""
+    entry = {"type": event_type, "timestamp": datetime.now().isoformat()}
+    entry.update({k: v for k, v in fields.items() if v is not None})
+    r.xadd(EVENTS_KEY, entry, maxlen=EVENTS_MAXLEN, approximate=True)
+
+
 def get_current_phase():
     """Get current active phase"""
     phase_json = r.get(PHASE_KEY)
     if phase_json:
-        return json.loads(phase_json)
+        return _loads(phase_json)
     return None
 
 
-def find_next_available_task(phase, agent_id):
+def block_dependents(task_id):
     """
-    Find next available task in current phase for agent
+    Mark pending tasks that depend on a failed task as 'blocked' (Fix #17)
 
-    Fix #17: Skip tasks that are blocked due to failed dependencies
+    Blocked is a terminal state, so the phase can still advance.
     """
-    for task_id in phase['tasks']:
-        task_json = r.hget(TASKS_KEY, task_id)
+    for dependent_id in r.smembers(BLOCKS_KEY.format(task_id)):
+        task_json = r.hget(TASKS_KEY, dependent_id)
         if not task_json:
             continue
 
-        task = json.loads(task_json)
-
-        # Check if task is available
-        # Fix #17: Skip blocked tasks
-        if task['status'] not in ['pending']:
-            continue
-
-        # Check if task type is enabled in config
-        task_type = task.get('type', 'development')
-        if not CONFIG['agent_assignment'].get(task_type, {}).get('enabled', True):
+        task = _loads(task_json)
+        if task['status'] != 'pending':
             continue
 
-        # Check dependencies (this may mark task as 'blocked')
-        if not all_dependencies_complete(task):
-            continue
+        logger.warning(
+            f"Task {dependent_id}: Dependency {task_id} failed, "
+            f"marking as blocked"
+        )
+        task['status'] = 'blocked'
+        task['blocked_reason'] = f"Dependency {task_id} failed"
+        task['blocked_at'] = datetime.now().isoformat()
+        r.hset(TASKS_KEY, dependent_id, _dumps(task))
 
-        return task
 
-    return None
+# Fix #6: Removed duplicate check_and_advance_phase() function
+# Phase advancement is handled by merge_coordinator._check_phase_advancement()
+# This avoids code duplication and ensures single source of truth
 
 
-def all_dependencies_complete(task):
+def release_dead_agent(agent_id):
     """
-    Check if all task dependencies are complete (Fix #17)
+    Release the task lock of a dead agent and remove it from the registry
 
-    A dependency is complete if:
-    - 'merged': Successfully merged to main ✓
-    - 'failed': Failed permanently (blocks dependent tasks) ❌
-
-    If any dependency failed, mark this task as 'blocked'
+    Returns: True if a task was reset to pending
     """
-    task_id = task['id']
+    agent_json = r.hget(AGENTS_KEY, agent_id)
+    if not agent_json:
+        return False
 
-    for dep_id in task.get('dependencies', []):
-        dep_json = r.hget(TASKS_KEY, dep_id)
-        if not dep_json:
-            # Dependency doesn't exist
-            logger.warning(f"Task {task_id}: Dependency {dep_id} not found")
-            return False
+    agent = _loads(agent_json)
+    released = False
 
-        dep = json.loads(dep_json)
-        dep_status = dep['status']
+    # Get current task
+    current_task = agent.get('current_task')
+    if current_task:
+        # Release task lock
+        lock_key = f"task_lock:{current_task}"
+        lock_deleted = r.delete(lock_key)
 
-        if dep_status == 'merged':
-            # Dependency successful, continue
-            continue
+        if lock_deleted:
+            logger.info(f"   🔓 Released lock for task {current_task}")
 
-        elif dep_status == 'failed':
-            # Dependency failed - block this task
-            logger.warning(
-                f"Task {task_id}: Dependency {dep_id} failed, "
-                f"marking as blocked"
-            )
+            # Reset task status to pending
+            task_json = r.hget(TASKS_KEY, current_task)
+            if task_json:
+                task = _loads(task_json)
+                task['status'] = 'pending'
+                task['assigned_to'] = None
+                # Remove timing fields so task can be reassigned
+                if 'started_at' in task:
+                    del task['started_at']
+                if 'completed_at' in task:
+                    del task['completed_at']
+                r.hset(TASKS_KEY, current_task, _dumps(task))
+                requeue_task(r, current_task)
+                logger.info(f"   ♻️  Reset task {current_task} to pending")
+                released = True
+
+    # Remove dead agent from registry
+    r.hdel(AGENTS_KEY, agent_id)
+    r.hdel(HEARTBEATS_KEY, agent_id)
+    logger.info(f"   🗑️  Removed dead agent {agent_id} from registry")
 
-            # Mark task as blocked
-            task['status'] = 'blocked'
-            task['blocked_reason'] = f"Dependency {dep_id} failed"
-            task['blocked_at'] = datetime.now().isoformat()
-            r.hset(TASKS_KEY, task_id, json.dumps(task))
+    return released
 
-            return False
 
-        else:
-            # Dependency still in progress (pending, in_progress, done, etc.)
-            return False
+def sweep_dead_agents(agent_timeout):
+    """
+    Release agents whose liveness key is already gone
 
-    return True
+    Expiry events are fire-and-forget, so this catches anything that
+    expired while nobody was subscribed (startup, leader handover,
+    reconnect). Agents without a liveness key yet fall back to the
+    heartbeat timestamp.
+    """
+    agents = r.hgetall(AGENTS_KEY)
+    heartbeats = r.hgetall(HEARTBEATS_KEY)
 
+    # Drop heartbeats from agents that are no longer registered
+    stale = [agent_id for agent_id in heartbeats if agent_id not in agents]
+    if stale:
+        r.hdel(HEARTBEATS_KEY, *stale)
 
-def determine_role(task_type):
-    """Determine agent role based on task type"""
-    role_mapping = {
-        'setup': 'setup-specialist',
-        'development': 'developer',
-        'testing': 'tester',
-        'security': 'security-auditor',
-        'documentation': 'technical-writer',
-        'review': 'code-reviewer'
-    }
-    return role_mapping.get(task_type, 'developer')
+    if not agents:
+        return
 
+    pipe = r.pipeline(transaction=False)
+    for agent_id in agents:
+        pipe.exists(ALIVE_KEY.format(agent_id))
+    alive_flags = pipe.execute()
 
-# Fix #6: Removed duplicate check_and_advance_phase() function
-# Phase advancement is handled by merge_coordinator._check_phase_advancement()
-# This avoids code duplication and ensures single source of truth
+    current_time = datetime.now()
+    for (agent_id, agent_json), alive in zip(agents.items(), alive_flags):
+        if alive:
+            continue
+        try:
+            agent = _loads(agent_json)
+            last_heartbeat_str = heartbeats.get(agent_id) or agent.get('last_heartbeat')
+            if last_heartbeat_str:
+                last_heartbeat = datetime.fromisoformat(last_heartbeat_str)
+                if (current_time - last_heartbeat).total_seconds() <= agent_timeout:
+                    continue
+
+            logger.warning(f"🪦 Agent {agent_id} is dead (no heartbeat for {agent_timeout}s+)")
+            release_dead_agent(agent_id)
+        except Exception as e:
+            logger.error(f"Error processing agent {agent_id}: {e}")
 
 
 # Fix #16: Dead Agent Lock Cleanup Service
-def dead_agent_cleanup_service():
+def dead_agent_cleanup_service(stop_event):
     """
     Background service that cleans up task locks from dead agents
 
-    Runs every 30 seconds and checks for agents that haven't sent
-    heartbeat in agent_timeout seconds. Releases their task locks.
+    Every heartbeat refreshes agent:<id>:alive with TTL agent_timeout.
+    The service waits on Redis key expiry events and releases an agent's
+    task lock the moment its liveness key expires. A sweep every
+    agent_timeout seconds backs it up: expiry events are lost while
+    disconnected, and never arrive if Redis refuses CONFIG SET (managed
+    services). Runs until stop_event is set (the lease was lost).
     """
+    from init import enable_keyspace_events
+
     logger.info("🧹 Dead agent cleanup service started")
 
     agent_timeout = CONFIG['redis']['agent_timeout']
-    cleanup_interval = 30  # Check every 30 seconds (more aggressive)
+    expired_channel = f"__keyevent@{CONFIG['redis']['db']}__:expired"
 
-    while True:
+    while not stop_event.is_set():
+        pubsub = r.pubsub(ignore_subscribe_messages=True)
         try:
-            time.sleep(cleanup_interval)
+            enable_keyspace_events(r, "Ex")
+            pubsub.subscribe(expired_channel)
 
-            # Get all agents
-            agents = r.hgetall(AGENTS_KEY)
-            if not agents:
-                continue
+            # Catch up on anything that expired while we weren't listening
+            sweep_dead_agents(agent_timeout)
+            last_sweep = time.monotonic()
+
+            while not stop_event.is_set():
+                if time.monotonic() - last_sweep >= agent_timeout:
+                    sweep_dead_agents(agent_timeout)
+                    last_sweep = time.monotonic()
+
+                message = pubsub.get_message(timeout=5)
+                if not message:
+                    continue
 
-            current_time = datetime.now()
-            cleaned_count = 0
-
-            for agent_id, agent_json in agents.items():
-                try:
-                    agent = json.loads(agent_json)
-
-                    # Check last heartbeat
-                    last_heartbeat_str = agent.get('last_heartbeat')
-                    if not last_heartbeat_str:
-                        continue
-
-                    last_heartbeat = datetime.fromisoformat(last_heartbeat_str)
-                    time_since_heartbeat = (current_time - last_heartbeat).total_seconds()
-
-                    # Agent is dead if no heartbeat for agent_timeout seconds
-                    if time_since_heartbeat > agent_timeout:
-                        logger.warning(
-                            f"🪦 Agent {agent_id} is dead "
-                            f"(no heartbeat for {int(time_since_heartbeat)}s)"
-                        )
-
-                        # Get current task
-                        current_task = agent.get('current_task')
-                        if current_task:
-                            # Release task lock
-                            lock_key = f"task_lock:{current_task}"
-                            lock_deleted = r.delete(lock_key)
-
-                            if lock_deleted:
-                                logger.info(f"   🔓 Released lock for task {current_task}")
-
-                                # Reset task status to pending
-                                task_json = r.hget(TASKS_KEY, current_task)
-                                if task_json:
-                                    task = json.loads(task_json)
-                                    task['status'] = 'pending'
-                                    task['assigned_to'] = None
-                                    # Remove timing fields so task can be reassigned
-                                    if 'started_at' in task:
-                                        del task['started_at']
-                                    if 'completed_at' in task:
-                                        del task['completed_at']
-                                    r.hset(TASKS_KEY, current_task, json.dumps(task))
-                                    logger.info(f"   ♻️  Reset task {current_task} to pending")
-                                    cleaned_count += 1
-
-                        # Remove dead agent from registry
-                        r.hdel(AGENTS_KEY, agent_id)
-                        logger.info(f"   🗑️  Removed dead agent {agent_id} from registry")
-
-                except Exception as e:
-                    logger.error(f"Error processing agent {agent_id}: {e}")
+                key = message['data']
+                if not (key.startswith('agent:') and key.endswith(':alive')):
                     continue
 
-            if cleaned_count > 0:
-                logger.info(f"✅ Cleanup cycle complete: {cleaned_count} tasks released")
+                agent_id = key[len('agent:'):-len(':alive')]
+                logger.warning(f"🪦 Agent {agent_id} is dead (heartbeat expired)")
+                if release_dead_agent(agent_id):
+                    logger.info(f"✅ Cleanup complete: task of {agent_id} released")
 
         except Exception as e:
             logger.error(f"❌ Cleanup service error: {e}")
-            time.sleep(5)  # Short sleep before retry
+            time.sleep(5)  # Short sleep before resubscribing
+        finally:
+            pubsub.close()
 
 
-if __name__ == "__main__":
-    logger.info("🚀 Starting AI Multi-Agent Orchestrator API...")
-    logger.info(f"📋 Configuration loaded from: {CONFIG_PATH}")
+def heartbeat_flush_service():
+    """
+    Flush buffered heartbeats to Redis once per second
+
+    Runs in every process (each has its own buffer). N agents beating
+    cost one pipelined round-trip per interval instead of two RTTs each.
+    """
+    agent_timeout = CONFIG['redis']['agent_timeout']
+
+    while True:
+        time.sleep(HEARTBEAT_FLUSH_INTERVAL)
+
+        with pending_heartbeats_lock:
+            if not PENDING_HEARTBEATS:
+                continue
+            snapshot = dict(PENDING_HEARTBEATS)
+            PENDING_HEARTBEATS.clear()
+
+        try:
+            pipe = r.pipeline(transaction=False)
+            pipe.hset(HEARTBEATS_KEY, mapping=snapshot)
+            for agent_id in snapshot:
+                pipe.set(ALIVE_KEY.format(agent_id), 1, ex=agent_timeout)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"❌ Heartbeat flush failed: {e}")
+            # Put them back unless a newer beat arrived meanwhile
+            with pending_heartbeats_lock:
+                for agent_id, beat in snapshot.items():
+                    PENDING_HEARTBEATS.setdefault(agent_id, beat)
+
+
+# Background services lease: with several gunicorn workers, only the
+# holder runs the merge worker and the dead agent cleanup service
+LEADER_KEY = "orchestrator:leader"
+LEADER_LEASE = 30  # seconds
+
+# Extend the lease only if this process still holds it: 1 if renewed
+RENEW_LEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+renew_lease_script = r.register_script(RENEW_LEASE_LUA)
+
+# This process's lease token; set by background_services_leader, which
+# runs after gunicorn forks (so the pid is the worker's)
+leader_token = None
+
+
+def holds_leader_lease():
+    """True if this process holds the background services lease right now"""
+    try:
+        return leader_token is not None and r.get(LEADER_KEY) == leader_token
+    except Exception as e:
+        logger.error(f"❌ Background services lease check failed: {e}")
+        return False
+
+
+def bootstrap():
+    """
+    Initialize orchestrator (load backlog, calculate phases)
 
-    # Initialize orchestrator (load backlog, calculate phases)
+    Runs once per deployment: from gunicorn's when_ready hook before any
+    worker is forked, or from __main__ when using the dev server.
+    """
     from init import initialize_orchestrator
     try:
         initialize_orchestrator(r, CONFIG)
+        refresh_config_cache()
         logger.info("✅ Orchestrator initialized successfully")
     except Exception as e:
         logger.error(f"❌ Failed to initialize orchestrator: {e}")
         sys.exit(1)
 
+
+def start_background_services():
+    """
+    Attach merge coordinator and start the background services lease
+
+    Called once per process. Every process can queue merges, but only the
+    lease holder runs the merge worker and the dead agent cleanup, so
+    merges into main stay sequential however many workers are serving.
+    """
     # Initialize merge coordinator (if auto-merge enabled)
     merge_coordinator = None
     if CONFIG['git'].get('auto_merge', {}).get('enabled', False):
         from merge_coordinator import MergeCoordinator
-        merge_coordinator = MergeCoordinator(r, CONFIG)
+        merge_coordinator = MergeCoordinator(
+            r, CONFIG, start_worker=False, lease_check=holds_leader_lease
+        )
         logger.info("✅ Merge coordinator initialized (auto-merge enabled)")
     else:
         logger.info("⚠️  Auto-merge disabled in config")
@@ -681,10 +913,70 @@ if __name__ == "__main__":
     # Store merge coordinator in app context for access in routes
     app.config['MERGE_COORDINATOR'] = merge_coordinator
 
-    # Fix #16: Start dead agent cleanup service
-    cleanup_thread = Thread(target=dead_agent_cleanup_service, daemon=True)
-    cleanup_thread.start()
-    logger.info("✅ Dead agent cleanup service started")
+    flush_thread = Thread(target=heartbeat_flush_service, daemon=True)
+    flush_thread.start()
+
+    leader_thread = Thread(target=background_services_leader, daemon=True)
+    leader_thread.start()
+
+
+def background_services_leader():
+    """
+    Acquire (and keep renewing) the background services lease
+
+    Whoever holds it starts the merge worker and the dead agent cleanup
+    service. If the holder dies the lease expires and another process
+    takes over within LEADER_LEASE seconds. A holder that fails to renew
+    (Redis outage, or blocked past the lease) stops both services, since
+    another process may already have taken over.
+    """
+    global leader_token
+    token = f"{os.uname().nodename}:{os.getpid()}"
+    leader_token = token
+    merge_coordinator = app.config.get('MERGE_COORDINATOR')
+    started = False
+    cleanup_stop = None
+
+    while True:
+        try:
+            held = bool(
+                r.set(LEADER_KEY, token, nx=True, ex=LEADER_LEASE)
+                or renew_lease_script(keys=[LEADER_KEY], args=[token, LEADER_LEASE])
+            )
+        except Exception as e:
+            logger.error(f"❌ Background services lease error: {e}")
+            held = False
+
+        if held and not started:
+            if merge_coordinator:
+                merge_coordinator.start()
+
+            # Fix #16: Start dead agent cleanup service
+            cleanup_stop = Event()
+            cleanup_thread = Thread(
+                target=dead_agent_cleanup_service, args=(cleanup_stop,), daemon=True
+            )
+            cleanup_thread.start()
+            logger.info(f"✅ Background services started (leader: {token})")
+            started = True
+
+        elif not held and started:
+            logger.warning("⚠️  Background services lease lost, stopping merge worker and cleanup")
+            cleanup_stop.set()
+            if merge_coordinator:
+                merge_coordinator.stop()
+            started = False
+
+        time.sleep(LEADER_LEASE / 3)
+
+
+if __name__ == "__main__":
+    # Dev server only; production runs under gunicorn (see gunicorn.conf.py)
+    logger.info("🚀 Starting AI Multi-Agent Orchestrator API...")
+    logger.info(f"📋 Configuration loaded from: {CONFIG_PATH}")
+
+    bootstrap()
+    start_background_services()
 
     # Start API server
     port = 8765
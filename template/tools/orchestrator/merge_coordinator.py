@@ -3,43 +3,183 @@
 Merge Coordinator
 
 Handles PR merging with:
-- Sequential merge queue (prevents race conditions)
+- Parallel merge pipeline (conflict checks and tests run concurrently in
+  per-task git worktrees; updates to main stay serialized)
 - Conflict detection & resolution
 - Test failure handling
 - Retry mechanism
 - Branch cleanup
 """
 
+import os
 import json
 import time
+import shutil
 import logging
 import subprocess
 from pathlib import Path
 from datetime import datetime
-from threading import Thread, Lock
+from threading import Thread, Lock, BoundedSemaphore, local
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from init import release_dependents
+
+try:
+    import pygit2
+except ImportError:  # fall back to the git CLI
+    pygit2 = None
+
+try:
+    import zstandard
+except ImportError:  # notifications are sent uncompressed
+    zstandard = None
+
+try:
+    from gevent import get_hub
+    from gevent.monkey import is_module_patched
+except ImportError:  # plain threads: nothing to keep off the hub
+    get_hub = None
+
+# Notifications larger than this are sent as b'Z' + zstd(JSON)
+NOTIFICATION_COMPRESS_MIN = 1024  # bytes
 
 logger = logging.getLogger(__name__)
 
 
+def _off_hub(fn, *args):
+    """
+    Call fn(*args) in gevent's native thread pool under a patched gevent
+    worker, else directly
+
+    libgit2 calls and deleting a checkout (rmtree) don't yield to the
+    hub, so run inline they would stall every request served by the
+    worker (and a long one could trip its timeout). The calling greenlet
+    waits cooperatively for the result.
+    """
+    if get_hub is not None and is_module_patched('threading'):
+        return get_hub().threadpool.apply(fn, args)
+    return fn(*args)
+
+
+TASKS_KEY = "orchestrator:tasks"
+PHASE_KEY = "orchestrator:current_phase"
+PHASES_KEY = "orchestrator:phases"
+
+# Patch fields of one task's JSON in place: one round-trip, and no window
+# between read and write for a concurrent merge to lose an update.
+# Returns nil if the task does not exist.
+UPDATE_TASK_LUA = """
+if cjson.decode_array_with_array_mt then
+    cjson.decode_array_with_array_mt(true)  -- keep [] as [] on re-encode
+end
+local task_json = redis.call('HGET', KEYS[1], ARGV[1])
+if not task_json then
+    return nil
+end
+local task = cjson.decode(task_json)
+for field, value in pairs(cjson.decode(ARGV[2])) do
+    task[field] = value
+end
+redis.call('HSET', KEYS[1], ARGV[1], cjson.encode(task))
+return 1
+"""
+
+# 1 if every task of the current phase is in a terminal state (ARGV),
+# 0 otherwise or if there is no current phase. Task JSON never leaves Redis.
+PHASE_COMPLETE_LUA = """
+local phase_json = redis.call('GET', KEYS[1])
+if not phase_json then
+    return 0
+end
+local terminal = {}
+for _, status in ipairs(ARGV) do
+    terminal[status] = true
+end
+for _, task_id in ipairs(cjson.decode(phase_json)['tasks']) do
+    local task_json = redis.call('HGET', KEYS[2], task_id)
+    if task_json and not terminal[cjson.decode(task_json)['status']] then
+        return 0
+    end
+end
+return 1
+"""
+
+# Move retries whose backoff has elapsed (score <= now) back onto the merge
+# queue; atomic, so a retry is never pushed twice
+PROMOTE_RETRIES_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, merge_request in ipairs(due) do
+    redis.call('ZREM', KEYS[1], merge_request)
+    redis.call('RPUSH', KEYS[2], merge_request)
+end
+return #due
+"""
+
+
 class MergeCoordinator:
     """
     Coordinates PR merging to prevent conflicts and ensure clean workflow
     """
 
-    def __init__(self, redis_client, config, project_root="/app"):
+    def __init__(self, redis_client, config, project_root="/app", start_worker=True,
+                 lease_check=None):
         self.redis = redis_client
         self.config = config
         self.project_root = Path(project_root)
         self.merge_lock = Lock()
         self.merge_queue_key = "orchestrator:merge_queue"
+        self.retry_queue_key = "orchestrator:merge_retry_queue"  # zset, score = due time
         self.active_merges_key = "orchestrator:active_merges"
+        self.events_key = "orchestrator:events"
+        self.pending_notifications_max = 100
+        self._update_task_script = redis_client.register_script(UPDATE_TASK_LUA)
+        self._promote_retries_script = redis_client.register_script(PROMOTE_RETRIES_LUA)
+        self._phase_complete_script = redis_client.register_script(PHASE_COMPLETE_LUA)
+
+        # Parallel merges: each task gets its own worktree; merge_lock keeps
+        # a single merger to main
+        auto_merge = config['git'].get('auto_merge', {})
+        self.max_parallel = max(1, min(auto_merge.get('max_parallel', 5), 10))
+        self.worktrees_dir = self.project_root / ".worktrees"
+        # Untracked dependency dirs that only exist in the main checkout;
+        # linked into each worktree so the checks find them
+        self.worktree_links = auto_merge.get(
+            'worktree_links', ['node_modules', '.venv', 'venv', 'vendor']
+        )
+        self.worktree_lock = Lock()
+        # Read-only git calls must not contend on .git/index.lock
+        self.read_only_env = {**os.environ, 'GIT_OPTIONAL_LOCKS': '0'}
+
+        # Local ref/object work goes through libgit2 in-process (one
+        # repository handle per thread) instead of spawning git
+        self._repo_local = local()
+        self._repo_disabled = pygit2 is None
+
+        # Processes that only queue merges leave the worker to the lease
+        # holder; lease_check() is asked again right before merging to main
+        self.lease_check = lease_check
+        self.running = False
+        self.worker_thread = None
+        self.executor = None
+        self.slots = BoundedSemaphore(self.max_parallel)
+        if start_worker:
+            self.start()
+
+        logger.info("✅ Merge Coordinator initialized")
 
-        # Start merge worker thread
+    def start(self):
+        """Start merge dispatcher thread, worker pool and retry promoter"""
+        if self.worker_thread:
+            return
+        self._prune_worktrees()
         self.running = True
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_parallel,
+            thread_name_prefix="merge"
+        )
         self.worker_thread = Thread(target=self._merge_worker, daemon=True)
         self.worker_thread.start()
-
-        logger.info("✅ Merge Coordinator initialized")
+        Thread(target=self._retry_promoter, daemon=True).start()
 
     def queue_merge(self, task_id: str, pr_url: str, branch_name: str, agent_id: str):
         """
@@ -68,29 +208,66 @@ class MergeCoordinator:
 
     def _merge_worker(self):
         """
-        Background worker that processes merge queue sequentially
+        Dispatcher: hands queued merge requests to the worker pool
+
+        Takes requests only for free pool slots, so anything not being
+        processed stays in the Redis queue. Bursts are drained with one
+        LPOP count=N instead of one BLPOP per request.
         """
-        logger.info("🔄 Merge worker started")
+        logger.info(f"🔄 Merge worker started (max_parallel: {self.max_parallel})")
 
         while self.running:
+            # One slot to wait for (rechecking running meanwhile), plus any
+            # others free right now
+            if not self.slots.acquire(timeout=1):
+                continue
+            held = 1
+            while held < self.max_parallel and self.slots.acquire(blocking=False):
+                held += 1
+
             try:
-                # Get next merge request from queue (blocking, timeout 5s)
-                result = self.redis.blpop(self.merge_queue_key, timeout=5)
+                # Drain up to `held` queued requests in one round-trip
+                batch = self.redis.lpop(self.merge_queue_key, held) or []
 
-                if not result:
-                    continue
+                if not batch:
+                    # Queue empty: block for the next one (timeout 5s)
+                    result = self.redis.blpop(self.merge_queue_key, timeout=5)
+                    batch = [result[1]] if result else []
 
-                _, merge_request_json = result
-                merge_request = json.loads(merge_request_json)
+                for _ in range(held - len(batch)):
+                    self.slots.release()
+                held = len(batch)
 
-                # Process merge
-                self._process_merge(merge_request)
+                if batch:
+                    merge_requests = [json.loads(request_json) for request_json in batch]
+                    held = 0  # released by the workers from here on
+                    self._dispatch(merge_requests)
 
             except Exception as e:
+                for _ in range(held):
+                    self.slots.release()
                 logger.error(f"❌ Merge worker error: {e}")
                 time.sleep(5)
 
-    def _process_merge(self, merge_request: dict):
+    def _dispatch(self, batch: list):
+        """
+        Submit merge requests to the worker pool (one slot each, already held)
+
+        With two or more requests, conflicts are checked for all of them
+        in a single `git merge-tree --stdin` process up front. That runs
+        before main is updated, so it is only a prefilter: a clean verdict
+        skips step 2, and every merge is checked again under merge_lock.
+        """
+        conflicts = {}
+        if len(batch) >= 2 and self._repo() is None:  # in-process checks need no batching
+            conflicts = self._check_conflicts_batch([req['branch_name'] for req in batch])
+
+        for merge_request in batch:
+            has_conflict = conflicts.get(merge_request['branch_name'])
+            future = self.executor.submit(self._process_merge, merge_request, has_conflict)
+            future.add_done_callback(lambda _: self.slots.release())
+
+    def _process_merge(self, merge_request: dict, has_conflict: bool = None):
         """
         Process a single merge request
 
@@ -101,6 +278,11 @@ class MergeCoordinator:
         4. Merge PR
         5. Cleanup branch
         6. Notify agent
+
+        Steps 2-3 run concurrently with other merges (tests in a per-task
+        worktree); steps that touch main (1, 4-6) hold merge_lock.
+        has_conflict is passed in when conflicts were checked in a batch
+        (against main before step 1); only a clean verdict is trusted.
         """
         task_id = merge_request['task_id']
         branch_name = merge_request['branch_name']
@@ -116,11 +298,13 @@ class MergeCoordinator:
         try:
             # Step 1: Update main branch
             logger.info(f"   [1/6] Updating main branch...")
-            self._update_main_branch()
+            with self.merge_lock:
+                self._update_main_branch()
 
             # Step 2: Check for conflicts
             logger.info(f"   [2/6] Checking for conflicts...")
-            has_conflict = self._check_conflicts(branch_name)
+            if has_conflict is not False:
+                has_conflict = self._check_conflicts(branch_name)
 
             if has_conflict:
                 logger.warning(f"   ⚠️  Conflict detected in {branch_name}")
@@ -130,7 +314,11 @@ class MergeCoordinator:
             # Step 3: Run tests
             if self.config['quality_gates']['run_tests']:
                 logger.info(f"   [3/6] Running tests...")
-                tests_passed = self._run_tests(branch_name)
+                worktree = self._acquire_worktree(task_id, branch_name)
+                try:
+                    tests_passed = self._run_tests(branch_name, worktree)
+                finally:
+                    self._release_worktree(worktree)
 
                 if not tests_passed:
                     logger.warning(f"   ❌ Tests failed for {branch_name}")
@@ -139,23 +327,45 @@ class MergeCoordinator:
             else:
                 logger.info(f"   [3/6] Tests skipped (disabled in config)")
 
-            # Step 4: Merge PR
-            logger.info(f"   [4/6] Merging PR...")
-            merge_success = self._merge_pr(pr_url, branch_name)
+            # One merger to main at a time
+            with self.merge_lock:
+                # merge_lock only covers this process: another process that
+                # took over the lease may be merging by now
+                if self.lease_check and not self.lease_check():
+                    logger.warning(f"   ⚠️  Lost the background services lease, requeueing {task_id}")
+                    self.redis.rpush(self.merge_queue_key, json.dumps(merge_request))
+                    return
+
+                # Other merges may have landed on main since step 2
+                has_conflict = self._check_conflicts(branch_name)
+                merge_success = False
+                if not has_conflict:
+                    # Step 4: Merge PR
+                    logger.info(f"   [4/6] Merging PR...")
+                    merge_success = self._merge_pr(pr_url, branch_name)
+
+                if merge_success:
+                    # Step 5: Cleanup branch
+                    logger.info(f"   [5/6] Cleaning up branch...")
+                    self._cleanup_branch(branch_name)
+
+                    # Step 6: Update task status
+                    logger.info(f"   [6/6] Updating task status...")
+                    self._mark_task_merged(task_id)
+
+                    # Check if phase can advance
+                    self._check_phase_advancement()
+
+            if has_conflict:
+                logger.warning(f"   ⚠️  Conflict detected in {branch_name} (main moved during tests)")
+                self._handle_conflict(merge_request)
+                return
 
             if not merge_success:
                 logger.error(f"   ❌ Merge failed for {task_id}")
                 self._handle_merge_failure(merge_request)
                 return
 
-            # Step 5: Cleanup branch
-            logger.info(f"   [5/6] Cleaning up branch...")
-            self._cleanup_branch(branch_name)
-
-            # Step 6: Update task status
-            logger.info(f"   [6/6] Updating task status...")
-            self._mark_task_merged(task_id)
-
             logger.info(f"✅ Merge complete: {task_id}")
 
             # Notify agent
@@ -163,9 +373,6 @@ class MergeCoordinator:
                 "message": f"Task {task_id} successfully merged to main"
             })
 
-            # Check if phase can advance
-            self._check_phase_advancement()
-
         except Exception as e:
             logger.error(f"❌ Merge error for {task_id}: {e}")
             self._handle_merge_failure(merge_request)
@@ -174,16 +381,44 @@ class MergeCoordinator:
             # Remove from active merges
             self.redis.hdel(self.active_merges_key, task_id)
 
+    def _repo(self):
+        """
+        This thread's pygit2 repository, or None to use the git CLI
+
+        libgit2 repository handles must not be shared between threads.
+        Anything slower than a ref lookup goes through _off_hub.
+        """
+        if self._repo_disabled:
+            return None
+
+        repo = getattr(self._repo_local, 'repo', None)
+        if repo is None:
+            try:
+                repo = self._repo_local.repo = pygit2.Repository(str(self.project_root))
+            except Exception as e:
+                logger.warning(f"pygit2 unavailable for {self.project_root}, using git CLI: {e}")
+                self._repo_disabled = True
+                return None
+        return repo
+
     def _update_main_branch(self):
         """Update local main branch from remote"""
+        main_branch = self.config['git']['main_branch']
         try:
             # Ensure we're on main
-            subprocess.run(
-                ["git", "checkout", self.config['git']['main_branch']],
-                cwd=self.project_root,
-                check=True,
-                capture_output=True
+            repo = self._repo()
+            on_main = (
+                repo is not None
+                and not repo.head_is_detached
+                and repo.head.shorthand == main_branch
             )
+            if not on_main:
+                subprocess.run(
+                    ["git", "checkout", main_branch],
+                    cwd=self.project_root,
+                    check=True,
+                    capture_output=True
+                )
 
             # Pull latest changes (if remote exists)
             if self.config['git'].get('push_to_remote', True):
@@ -201,33 +436,114 @@ class MergeCoordinator:
             logger.error(f"Failed to update main: {e}")
             raise
 
+    def _prune_worktrees(self):
+        """Drop task worktrees left behind by a previous (crashed) worker"""
+        try:
+            _off_hub(shutil.rmtree, self.worktrees_dir, True)
+            self._prune_worktree_metadata()
+        except Exception as e:
+            logger.warning(f"Worktree prune failed: {e}")
+
+    def _prune_worktree_metadata(self, name: str = None):
+        """
+        Forget worktrees whose directory is gone (just `name`, or all)
+
+        In-process through libgit2 when available, else `git worktree prune`.
+        """
+        if self._repo_disabled or not _off_hub(self._prune_worktree_entries, name):
+            subprocess.run(
+                ["git", "worktree", "prune"],
+                cwd=self.project_root,
+                capture_output=True
+            )
+
+    def _prune_worktree_entries(self, name: str = None) -> bool:
+        """_prune_worktree_metadata through pygit2; False if it can't be used"""
+        repo = self._repo()
+        if repo is None:
+            return False
+
+        for worktree_name in ([name] if name else repo.list_worktrees()):
+            try:
+                worktree = repo.lookup_worktree(worktree_name)
+            except (KeyError, pygit2.GitError):
+                continue
+            if worktree.is_prunable:
+                worktree.prune(True)
+        return True
+
+    def _acquire_worktree(self, task_id: str, branch_name: str) -> Path:
+        """
+        Check out branch in its own worktree under .worktrees/<task_id>
+
+        Worktrees share the object database, so concurrent merges don't
+        fight over the main working tree. Installed dependencies
+        (worktree_links, e.g. node_modules) are symlinked from the main
+        checkout, which a fresh checkout lacks.
+
+        Returns: Worktree path
+        """
+        worktree = self.worktrees_dir / task_id
+
+        with self.worktree_lock:
+            # Leftover from a crashed run
+            if worktree.exists():
+                _off_hub(shutil.rmtree, worktree, True)
+                self._prune_worktree_metadata(worktree.name)
+
+            subprocess.run(
+                ["git", "worktree", "add", "--detach", str(worktree), branch_name],
+                cwd=self.project_root,
+                check=True,
+                capture_output=True
+            )
+
+        for name in self.worktree_links:
+            source = self.project_root / name
+            target = worktree / name
+            # rmtree on release unlinks the symlink, never the target
+            if source.is_dir() and not os.path.lexists(target):
+                target.symlink_to(source, target_is_directory=True)
+
+        return worktree
+
+    def _release_worktree(self, worktree: Path):
+        """Remove a task worktree (same as `git worktree remove --force`)"""
+        with self.worktree_lock:
+            _off_hub(shutil.rmtree, worktree, True)
+            self._prune_worktree_metadata(worktree.name)
+
     def _check_conflicts(self, branch_name: str) -> bool:
         """
         Check if branch has conflicts with main
 
+        The merge is computed in the object database only (libgit2's
+        merge_commits, or `git merge-tree --write-tree` without pygit2):
+        no checkout, no index, nothing to abort, and safe to run
+        concurrently.
+
         Returns: True if conflicts exist, False otherwise
         """
         try:
-            # Try to merge branch into main (dry run)
+            if not self._repo_disabled:
+                has_conflict = _off_hub(self._merge_commits_conflict, branch_name)
+                if has_conflict is not None:
+                    return has_conflict
+
             result = subprocess.run(
-                ["git", "merge", "--no-commit", "--no-ff", branch_name],
+                ["git", "merge-tree", "--write-tree", "--name-only",
+                 self.config['git']['main_branch'], branch_name],
                 cwd=self.project_root,
+                env=self.read_only_env,
                 capture_output=True,
                 text=True
             )
 
-            # Abort the merge (Fix #9: ignore errors if no merge to abort)
-            subprocess.run(
-                ["git", "merge", "--abort"],
-                cwd=self.project_root,
-                capture_output=True,
-                check=False  # Don't raise on error (might not be a merge in progress)
-            )
-
-            # Check for conflict indicators
+            # 0 = clean, 1 = conflicts (files listed on stdout)
+            if result.returncode == 1:
+                return True
             if result.returncode != 0:
-                if "CONFLICT" in result.stdout or "CONFLICT" in result.stderr:
-                    return True
+                raise RuntimeError(result.stderr.strip())
 
             return False
 
@@ -235,50 +551,128 @@ class MergeCoordinator:
             logger.error(f"Conflict check failed: {e}")
             return True  # Assume conflict on error
 
-    def _run_tests(self, branch_name: str) -> bool:
+    def _merge_commits_conflict(self, branch_name: str):
+        """In-process conflict check; None if pygit2 can't be used"""
+        repo = self._repo()
+        if repo is None:
+            return None
+        main_commit = repo.revparse_single(self.config['git']['main_branch']).peel(pygit2.Commit)
+        branch_commit = repo.revparse_single(branch_name).peel(pygit2.Commit)
+        index = repo.merge_commits(main_commit, branch_commit)
+        return index.conflicts is not None
+
+    def _check_conflicts_batch(self, branch_names: list) -> dict:
         """
-        Run tests on branch
+        Check several branches against main in one `git merge-tree --stdin`
 
-        Returns: True if tests pass, False otherwise
+        Returns: {branch_name: has_conflict}; empty if the batch could not
+        be checked (e.g. a missing branch aborts the whole run), in which
+        case each merge checks on its own.
         """
+        main_branch = self.config['git']['main_branch']
+        stdin = "".join(f"{main_branch} {branch}\n" for branch in branch_names)
+
         try:
-            # Checkout branch
-            subprocess.run(
-                ["git", "checkout", branch_name],
+            result = subprocess.run(
+                ["git", "merge-tree", "--stdin", "--name-only"],
+                input=stdin,
                 cwd=self.project_root,
-                check=True,
-                capture_output=True
+                env=self.read_only_env,
+                capture_output=True,
+                text=True
             )
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip())
+
+            # NUL-delimited, per merge: <1 clean|0 conflict> <tree OID>, then
+            # for conflicts: <files...> "" <messages...> ""; clean merges end
+            # with a single ""
+            fields = result.stdout.split("\0")
+            conflicts = {}
+            pos = 0
+            for branch in branch_names:
+                clean = fields[pos] == "1"
+                pos += 2
+                if not clean:
+                    while fields[pos]:  # conflicted files
+                        pos += 1
+                    pos += 1
+                    while fields[pos]:  # <n paths> <paths...> <type> <message>
+                        pos += int(fields[pos]) + 3
+                pos += 1
+                conflicts[branch] = not clean
+
+            return conflicts
 
-            # Run quality checks
-            checks = self.config['quality_gates']['checks']
+        except Exception as e:
+            logger.warning(f"Batch conflict check failed, checking individually: {e}")
+            return {}
 
-            for check in checks:
-                if not check.get('required', False):
-                    continue
+    def _run_tests(self, branch_name: str, worktree: Path) -> bool:
+        """
+        Run tests on branch (checked out in worktree)
 
-                logger.info(f"      Running: {check['name']}...")
+        Required checks run concurrently; the first failure kills the rest.
+        A pass is cached per commit SHA, so a retried merge of an unchanged
+        branch skips the checks.
 
-                try:
-                    subprocess.run(
+        Returns: True if tests pass, False otherwise
+        """
+        try:
+            repo = self._repo()
+            if repo is not None:
+                sha = str(repo.revparse_single(branch_name).peel(pygit2.Commit).id)
+            else:
+                sha = subprocess.check_output(
+                    ["git", "rev-parse", branch_name],
+                    cwd=self.project_root,
+                    env=self.read_only_env,
+                    text=True
+                ).strip()
+            result_key = f"orchestrator:test_result:{sha}"
+            if self.redis.get(result_key) == "pass":
+                logger.info(f"      Tests already passed for {sha[:8]}, skipping")
+                return True
+
+            # Run quality checks
+            checks = [c for c in self.config['quality_gates']['checks'] if c.get('required', False)]
+            if not checks:
+                return True
+
+            procs = {}
+            try:
+                for check in checks:
+                    logger.info(f"      Running: {check['name']}...")
+                    procs[check['name']] = subprocess.Popen(
                         check['command'].split(),
-                        cwd=self.project_root,
-                        check=True,
-                        capture_output=True,
-                        timeout=300  # 5 min timeout
+                        cwd=worktree,
+                        env=self.read_only_env,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL
                     )
-                except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
-                    logger.warning(f"      ❌ {check['name']} failed")
-                    return False
-
-            # Go back to main
-            subprocess.run(
-                ["git", "checkout", self.config['git']['main_branch']],
-                cwd=self.project_root,
-                check=True,
-                capture_output=True
-            )
 
+                with ThreadPoolExecutor(max_workers=len(procs)) as executor:
+                    futures = {
+                        executor.submit(proc.wait, timeout=300): name  # 5 min timeout
+                        for name, proc in procs.items()
+                    }
+                    for future in as_completed(futures):
+                        try:
+                            returncode = future.result()
+                        except subprocess.TimeoutExpired:
+                            returncode = None
+                        if returncode != 0:
+                            logger.warning(f"      ❌ {futures[future]} failed")
+                            for proc in procs.values():
+                                proc.kill()
+                            return False
+            finally:
+                for proc in procs.values():
+                    if proc.poll() is None:
+                        proc.kill()
+                        proc.wait()
+
+            self.redis.setex(result_key, 3600, "pass")
             return True
 
         except Exception as e:
@@ -315,21 +709,32 @@ class MergeCoordinator:
             # Local merge (no remote or no PR URL)
             if not self.config['git'].get('push_to_remote', True) or not pr_url:
                 # Local merge (no remote)
-                # Merge branch to main
-                subprocess.run(
-                    ["git", "merge", "--squash", branch_name],
-                    cwd=self.project_root,
-                    check=True,
-                    capture_output=True
-                )
+                try:
+                    # Merge branch to main
+                    subprocess.run(
+                        ["git", "merge", "--squash", branch_name],
+                        cwd=self.project_root,
+                        check=True,
+                        capture_output=True
+                    )
 
-                # Commit
-                subprocess.run(
-                    ["git", "commit", "-m", f"Merge {branch_name}"],
-                    cwd=self.project_root,
-                    check=True,
-                    capture_output=True
-                )
+                    # Commit
+                    subprocess.run(
+                        ["git", "commit", "-m", f"Merge {branch_name}"],
+                        cwd=self.project_root,
+                        check=True,
+                        capture_output=True
+                    )
+                except subprocess.CalledProcessError:
+                    # Don't leave main half-merged (conflict markers, staged
+                    # squash) for every later pull to trip over; --merge
+                    # keeps unrelated local changes (no MERGE_HEAD to abort)
+                    subprocess.run(
+                        ["git", "reset", "--merge"],
+                        cwd=self.project_root,
+                        capture_output=True
+                    )
+                    raise
 
                 return True
 
@@ -341,11 +746,12 @@ class MergeCoordinator:
         """Delete merged branch"""
         try:
             # Delete local branch
-            subprocess.run(
-                ["git", "branch", "-D", branch_name],
-                cwd=self.project_root,
-                capture_output=True
-            )
+            if self._repo_disabled or not _off_hub(self._delete_local_branch, branch_name):
+                subprocess.run(
+                    ["git", "branch", "-D", branch_name],
+                    cwd=self.project_root,
+                    capture_output=True
+                )
 
             # Delete remote branch (if exists)
             if self.config['git'].get('push_to_remote', True):
@@ -358,14 +764,30 @@ class MergeCoordinator:
         except Exception as e:
             logger.warning(f"Branch cleanup failed: {e}")
 
+    def _delete_local_branch(self, branch_name: str) -> bool:
+        """Delete branch through pygit2; False if pygit2 can't be used"""
+        repo = self._repo()
+        if repo is None:
+            return False
+        if branch_name in repo.branches.local:
+            repo.branches.delete(branch_name)
+        return True
+
     def _mark_task_merged(self, task_id: str):
         """Mark task as merged in Redis"""
-        task_json = self.redis.hget("orchestrator:tasks", task_id)
-        if task_json:
-            task = json.loads(task_json)
-            task['status'] = 'merged'
-            task['merged_at'] = datetime.now().isoformat()
-            self.redis.hset("orchestrator:tasks", task_id, json.dumps(task))
+        self._update_task(task_id, {
+            "status": "merged",
+            "merged_at": datetime.now().isoformat()
+        })
+
+        # Dependents whose last unmerged dependency this was become claimable
+        ready = release_dependents(self.redis, task_id)
+        if ready:
+            logger.info(f"   🔓 Unblocked: {', '.join(sorted(ready))}")
+
+    def _update_task(self, task_id: str, fields: dict):
+        """Atomically merge fields into a task's JSON in Redis"""
+        self._update_task_script(keys=[TASKS_KEY], args=[task_id, json.dumps(fields)])
 
     def _handle_conflict(self, merge_request: dict):
         """
@@ -383,15 +805,13 @@ class MergeCoordinator:
         logger.warning(f"🔧 Handling conflict for {task_id}")
 
         # Mark task as needs_conflict_resolution
-        task_json = self.redis.hget("orchestrator:tasks", task_id)
-        if task_json:
-            task = json.loads(task_json)
-            task['status'] = 'conflict'
-            task['conflict_info'] = {
+        self._update_task(task_id, {
+            "status": "conflict",
+            "conflict_info": {
                 "branch": branch_name,
                 "detected_at": datetime.now().isoformat()
             }
-            self.redis.hset("orchestrator:tasks", task_id, json.dumps(task))
+        })
 
         # Notify agent to fix conflict
         self._notify_agent(agent_id, task_id, "conflict_detected", {
@@ -418,11 +838,7 @@ class MergeCoordinator:
         logger.warning(f"🧪 Handling test failure for {task_id}")
 
         # Mark task as test_failed
-        task_json = self.redis.hget("orchestrator:tasks", task_id)
-        if task_json:
-            task = json.loads(task_json)
-            task['status'] = 'test_failed'
-            self.redis.hset("orchestrator:tasks", task_id, json.dumps(task))
+        self._update_task(task_id, {"status": "test_failed"})
 
         # Notify agent
         self._notify_agent(agent_id, task_id, "tests_failed", {
@@ -446,22 +862,19 @@ class MergeCoordinator:
         if retry_count < 3:
             # Retry
             merge_request['retry_count'] = retry_count + 1
-            time.sleep(5 * (retry_count + 1))  # Exponential backoff
+            delay = 5 * (retry_count + 1)  # Exponential backoff
 
-            # Re-queue
-            self.redis.rpush(self.merge_queue_key, json.dumps(merge_request))
-            logger.info(f"🔄 Re-queued {task_id} for retry")
+            # Re-queue once the backoff has elapsed (see _retry_promoter);
+            # the worker moves on to other merges meanwhile
+            self.redis.zadd(self.retry_queue_key, {json.dumps(merge_request): time.time() + delay})
+            logger.info(f"🔄 Re-queued {task_id} for retry in {delay}s")
 
         else:
             # Max retries exceeded
             logger.error(f"❌ Max retries exceeded for {task_id}")
 
             # Mark as failed
-            task_json = self.redis.hget("orchestrator:tasks", task_id)
-            if task_json:
-                task = json.loads(task_json)
-                task['status'] = 'merge_failed'
-                self.redis.hset("orchestrator:tasks", task_id, json.dumps(task))
+            self._update_task(task_id, {"status": "merge_failed"})
 
             # Notify agent
             self._notify_agent(merge_request['agent_id'], task_id, "merge_failed", {
@@ -469,11 +882,24 @@ class MergeCoordinator:
                 "action_required": "manual_intervention"
             })
 
+    def _retry_promoter(self):
+        """Move merge retries back onto the merge queue once they are due"""
+        while self.running:
+            try:
+                self._promote_retries_script(
+                    keys=[self.retry_queue_key, self.merge_queue_key],
+                    args=[time.time(), 32]
+                )
+            except Exception as e:
+                logger.error(f"❌ Retry promoter error: {e}")
+            time.sleep(1)
+
     def _notify_agent(self, agent_id: str, task_id: str, event_type: str, data: dict):
         """
         Notify agent about merge event
 
-        Uses Redis pub/sub for real-time notifications
+        Uses Redis pub/sub for real-time notifications; all writes go out
+        in one pipelined round-trip. Large payloads are zstd-compressed.
         """
         notification = {
             "agent_id": agent_id,
@@ -483,13 +909,31 @@ class MergeCoordinator:
             "timestamp": datetime.now().isoformat()
         }
 
+        payload = json.dumps(notification).encode()
+        if zstandard and len(payload) > NOTIFICATION_COMPRESS_MIN:
+            # Compressors aren't thread-safe; large payloads are rare
+            payload = b'Z' + zstandard.ZstdCompressor(level=3).compress(payload)
+
+        pipe = self.redis.pipeline(transaction=False)
+
         # Publish to agent's notification channel
         channel = f"agent:{agent_id}:notifications"
-        self.redis.publish(channel, json.dumps(notification))
+        pipe.publish(channel, payload)
 
-        # Also store in Redis for later retrieval
+        # Also store in Redis for later retrieval (most recent only)
         notif_key = f"agent:{agent_id}:notifications:pending"
-        self.redis.rpush(notif_key, json.dumps(notification))
+        pipe.rpush(notif_key, payload)
+        pipe.ltrim(notif_key, -self.pending_notifications_max, -1)
+
+        # Audit trail (merged, conflict, test/merge failure)
+        pipe.xadd(self.events_key, {
+            "type": event_type,
+            "task_id": task_id,
+            "agent": agent_id,
+            "timestamp": notification['timestamp']
+        }, maxlen=10000, approximate=True)
+
+        pipe.execute()
 
         logger.info(f"📬 Notified {agent_id}: {event_type} for {task_id}")
 
@@ -502,30 +946,23 @@ class MergeCoordinator:
         Fix #17: Phase can advance even if some tasks are 'blocked'
         """
         try:
-            # Get current phase
-            phase_json = self.redis.get("orchestrator:current_phase")
-            if not phase_json:
-                return
-
-            phase = json.loads(phase_json)
-
-            # Check if all tasks in phase are in terminal state
+            # Check if all tasks in phase are in terminal state (one
+            # script call, evaluated in Redis)
             # Terminal states: merged, failed, blocked
-            all_complete = True
-            for task_id in phase['tasks']:
-                task_json = self.redis.hget("orchestrator:tasks", task_id)
-                if not task_json:
-                    continue
+            # Fix #17: Include 'blocked' as terminal state
+            all_complete = self._phase_complete_script(
+                keys=[PHASE_KEY, TASKS_KEY],
+                args=['merged', 'failed', 'blocked']
+            ) == 1
 
-                task = json.loads(task_json)
-                status = task['status']
+            if all_complete:
+                # Get current phase
+                phase_json = self.redis.get(PHASE_KEY)
+                if not phase_json:
+                    return
 
-                # Fix #17: Include 'blocked' as terminal state
-                if status not in ['merged', 'failed', 'blocked']:
-                    all_complete = False
-                    break
+                phase = json.loads(phase_json)
 
-            if all_complete:
                 logger.info(f"✅ Phase {phase['id']} ({phase['name']}) complete!")
 
                 # Mark phase as complete
@@ -533,7 +970,7 @@ class MergeCoordinator:
                 phase['completed_at'] = datetime.now().isoformat()
 
                 # Move to next phase
-                phases_json = self.redis.get("orchestrator:phases")
+                phases_json = self.redis.get(PHASES_KEY)
                 if phases_json:
                     phases = json.loads(phases_json)
 
@@ -547,21 +984,28 @@ class MergeCoordinator:
                         # Save updated phases
                         phases[phase['id'] - 1] = phase
                         phases[next_phase_idx] = next_phase
-                        self.redis.set("orchestrator:phases", json.dumps(phases))
+                        self.redis.set(PHASES_KEY, json.dumps(phases))
 
                         # Set as current phase
-                        self.redis.set("orchestrator:current_phase", json.dumps(next_phase))
+                        self.redis.set(PHASE_KEY, json.dumps(next_phase))
 
                         logger.info(f"📍 Starting Phase {next_phase['id']} ({next_phase['name']})")
                     else:
                         logger.info("🎉 All phases complete!")
-                        self.redis.delete("orchestrator:current_phase")
+                        self.redis.delete(PHASE_KEY)
 
         except Exception as e:
             logger.error(f"Error checking phase advancement: {e}")
 
     def stop(self):
-        """Stop merge coordinator"""
+        """Stop merge coordinator (start() can be called again afterwards)"""
         logger.info("🛑 Stopping merge coordinator...")
         self.running = False
-        self.worker_thread.join(timeout=10)
+        # Dispatcher first: it exits within one BLPOP timeout, and nothing
+        # it popped is submitted to a pool that is already shut down
+        if self.worker_thread:
+            self.worker_thread.join(timeout=10)
+        if self.executor:
+            self.executor.shutdown(wait=True)
+        self.worker_thread = None
+        self.executor = None
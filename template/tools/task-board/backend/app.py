@@ -2,38 +2,74 @@
 """
 Task Board Backend - Minimal Flask + SSE
 Auto-detects available port (9090-9099)
+
+Served by gunicorn with a single gevent worker: each SSE client is a
+greenlet instead of an OS thread.
 """
+# Patch before anything imports socket/threading/queue
+from gevent import monkey
+monkey.patch_all()
+
+import hashlib
+import orjson
 import os
 import socket
 import sys
 from pathlib import Path
 from flask import Flask, jsonify, request, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-from file_manager import TaskFileManager
+from gunicorn.app.base import BaseApplication
+from file_manager import TaskFileManager, json_default
 from sse import SSEManager
 from watcher import start_file_watcher
 
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON via orjson: jsonify() and request.json encode/decode in C"""
+
+    # YAML can yield dates and non-string keys; boards may be read-only views
+    options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=json_default, option=self.options).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=json_default, option=self.options),
+            mimetype='application/json'
+        )
+
+
 app = Flask(__name__, static_folder='../frontend', static_url_path='')
+app.json = OrjsonProvider(app)
 CORS(app)
 
 # Global managers
 sse_manager = SSEManager()
 file_manager = None
 
+# File-change notifications: debounced by the watcher, skipped if unchanged
+FILE_CHANGE_DEBOUNCE = 0.05  # seconds
+_last_broadcast_hash = None
+
 
 def find_available_port(start_port=9090, end_port=9099):
     """Find first available port in range"""
     for port in range(start_port, end_port + 1):
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex(('127.0.0.1', port))
-            sock.close()
-
-            if result != 0:  # Port is available
-                return port
-        except:
-            continue
+        # Binding is a local check (no connection attempt); SO_REUSEADDR
+        # lets ports lingering in TIME_WAIT count as free
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                sock.bind(('0.0.0.0', port))  # same address the server binds
+            except OSError:
+                continue
+            return port
 
     raise RuntimeError(f"No available ports in range {start_port}-{end_port}")
 
@@ -48,7 +84,7 @@ def health():
 def get_tasks():
     """Get all tasks"""
     try:
-        data = file_manager.read_tasks()
+        data = file_manager.read_tasks(readonly=True)
         return jsonify(data), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -64,37 +100,9 @@ def create_task():
         new_task['source'] = 'manual'
         new_task['status'] = 'backlog'
 
-        # Read current tasks
-        data = file_manager.read_tasks()
-
-        # Generate ID - check ALL columns for existing IDs
-        all_tasks = []
-        for column in ['backlog', 'inProgress', 'blocked', 'done']:
-            all_tasks.extend(data.get(column, []))
-
-        # Extract numeric IDs and find max
-        existing_nums = []
-        for t in all_tasks:
-            task_id = t.get('id', '')
-            if task_id.startswith('T') and len(task_id) > 1:
-                try:
-                    num = int(task_id[1:])
-                    existing_nums.append(num)
-                except ValueError:
-                    continue
-
-        # Generate next ID
-        next_id = max(existing_nums) + 1 if existing_nums else 1
-        task_id = f"T{next_id:03d}"
-        new_task['id'] = task_id
-
-        # Add to backlog
-        if 'backlog' not in data:
-            data['backlog'] = []
-        data['backlog'].append(new_task)
-
-        # Write back
-        file_manager.write_tasks(data)
+        # Log the change (compacted into the YAML shortly after); the ID
+        # is allocated under the file lock
+        file_manager.append_delta('create', None, new_task)
 
         # Notify SSE clients
         sse_manager.notify_all('task_created', new_task)
@@ -112,17 +120,7 @@ def update_task(task_id):
         data = file_manager.read_tasks()
 
         # Find task and its column
-        task = None
-        task_column = None
-        for column in ['backlog', 'inProgress', 'done']:
-            tasks = data.get(column, [])
-            for t in tasks:
-                if t.get('id') == task_id:
-                    task = t
-                    task_column = column
-                    break
-            if task:
-                break
+        task, task_column = file_manager.find_task(data, task_id, ('backlog', 'inProgress', 'done'))
 
         if not task:
             return jsonify({"error": "Task not found"}), 404
@@ -134,18 +132,10 @@ def update_task(task_id):
         # Update task
         task.update(updates)
 
-        # If task was in DONE, move it back to BACKLOG (so AI can re-process)
-        if task_column == 'done':
-            # Remove from done
-            data['done'] = [t for t in data.get('done', []) if t.get('id') != task_id]
-
-            # Add to backlog
-            if 'backlog' not in data:
-                data['backlog'] = []
-            data['backlog'].append(task)
-
-        # Write back
-        file_manager.write_tasks(data)
+        # Log the change (compacted into the YAML shortly after). If task
+        # was in DONE, move it back to BACKLOG (so AI can re-process)
+        file_manager.append_delta('update', task_id, updates,
+                                  move_to='backlog' if task_column == 'done' else None)
 
         # Notify SSE clients
         sse_manager.notify_all('task_updated', task)
@@ -163,20 +153,18 @@ def change_priority(task_id):
         data = file_manager.read_tasks()
 
         # Find and update
-        for column in ['backlog', 'inProgress', 'done']:
-            tasks = data.get(column, [])
-            for task in tasks:
-                if task.get('id') == task_id:
-                    # Don't allow priority change for in-progress AI tasks
-                    if task.get('status') == 'inProgress' and task.get('source') != 'manual':
-                        return jsonify({"error": "Cannot change priority of running task"}), 403
-
-                    task['pri'] = new_priority
-                    file_manager.write_tasks(data)
-                    sse_manager.notify_all('priority_changed', task)
-                    return jsonify(task), 200
-
-        return jsonify({"error": "Task not found"}), 404
+        task, _ = file_manager.find_task(data, task_id, ('backlog', 'inProgress', 'done'))
+        if not task:
+            return jsonify({"error": "Task not found"}), 404
+
+        # Don't allow priority change for in-progress AI tasks
+        if task.get('status') == 'inProgress' and task.get('source') != 'manual':
+            return jsonify({"error": "Cannot change priority of running task"}), 403
+
+        task['pri'] = new_priority
+        file_manager.append_delta('update', task_id, {'pri': new_priority})
+        sse_manager.notify_all('priority_changed', task)
+        return jsonify(task), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -204,17 +192,59 @@ def serve_static(path):
 
 
 def on_file_change():
-    """Callback when backlog.yaml changes"""
+    """
+    Callback when backlog.yaml changes (once per burst of events)
+
+    Reads the board and sends it to SSE clients, unless it hasn't changed.
+    """
+    global _last_broadcast_hash
     try:
-        data = file_manager.read_tasks()
+        data = file_manager.read_tasks(readonly=True)
+
+        digest = hashlib.blake2b(orjson.dumps(
+            data, default=json_default, option=orjson.OPT_SORT_KEYS | OrjsonProvider.options
+        )).digest()
+        if digest == _last_broadcast_hash:
+            return  # Clients already have this state
+        _last_broadcast_hash = digest
+
         sse_manager.notify_all('file_changed', data)
     except Exception as e:
         print(f"Error reading file on change: {e}", file=sys.stderr)
 
 
-def main():
+class TaskBoardServer(BaseApplication):
+    """Embedded gunicorn: the port is only known after auto-detection"""
+
+    def __init__(self, backlog_path, options):
+        self.backlog_path = backlog_path
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # Runs in the worker after fork, so the watcher and compaction
+        # timers live in the process that serves the SSE clients
+        init_board(self.backlog_path)
+        return app
+
+
+def init_board(backlog_path):
+    """Open the backlog and start watching it"""
     global file_manager
 
+    # Initialize file manager
+    file_manager = TaskFileManager(backlog_path)
+
+    # Start file watcher (polling applies to the watchdog fallback only: its
+    # inotify observer would block the gevent hub)
+    start_file_watcher(backlog_path, on_file_change, polling=True, debounce=FILE_CHANGE_DEBOUNCE)
+
+
+def main():
     # Find available port
     try:
         port_range = os.environ.get('PORT_RANGE', '9090-9099')
@@ -226,12 +256,6 @@ def main():
     # Get backlog path
     backlog_path = Path(os.environ.get('BACKLOG_PATH', '../../memory-bank/work/backlog.yaml'))
 
-    # Initialize file manager
-    file_manager = TaskFileManager(backlog_path)
-
-    # Start file watcher
-    start_file_watcher(backlog_path, on_file_change)
-
     # Print startup info
     print("=" * 60)
     print("🚀 Task Board Started")
@@ -242,13 +266,15 @@ def main():
     print("=" * 60)
     print()
 
-    # Run server
-    app.run(
-        host='0.0.0.0',
-        port=port,
-        debug=False,
-        threaded=True
-    )
+    # Run server. One worker: SSE clients and the board state are
+    # in-process, so every client must be served by the same process
+    TaskBoardServer(backlog_path, {
+        'bind': f'0.0.0.0:{port}',
+        'worker_class': 'gevent',
+        'workers': 1,
+        'worker_connections': 1000,
+        'timeout': 60,
+    }).run()
 
 
 if __name__ == '__main__':
@@ -1,10 +1,56 @@
 """
 File Manager - Safe YAML read/write with file locking
+
+Writers (WAL appends, compaction, full writes) exclude each other with an
+exclusive lock on backlog.lock. Readers take no lock: the YAML is only
+ever replaced by an atomic rename, and the WAL is read before the YAML
+(see _read_board), so a reader always sees a consistent board.
+
+Board mutations are appended to a write-ahead log (backlog.wal.jsonl) and
+compacted into backlog.yaml shortly afterwards, instead of rewriting the
+whole YAML on every change.
 """
+import atexit
+import copy
 import fcntl
+import hashlib
+import logging
+import orjson
+import os
+import threading
 import time
 import yaml
+from contextlib import contextmanager
 from pathlib import Path
+from types import MappingProxyType
+
+# libyaml C bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+logger = logging.getLogger(__name__)
+
+TASK_COLUMNS = ('backlog', 'inProgress', 'blocked', 'done')
+
+# Agents and the orchestrator read backlog.yaml directly, so deltas must not
+# sit in the WAL for long
+COMPACT_DELAY = 1.0  # seconds after the first uncompacted delta
+COMPACT_THRESHOLD = 1000  # entries, if the board has no flushThreshold
+
+# Contended backlog.lock: yield the CPU this many times, then sleep with
+# exponential backoff up to LOCK_MAX_SLEEP (writers hold it for ms)
+LOCK_SPINS = 100
+LOCK_MAX_SLEEP = 0.05  # seconds
+
+
+def json_default(obj):
+    """orjson default for boards: read_tasks(readonly=True) views as dicts,
+    anything else YAML produced (dates, ...) as str"""
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    return str(obj)
 
 
 class TaskFileManager:
@@ -13,12 +59,46 @@ class TaskFileManager:
     def __init__(self, file_path: Path):
         self.file_path = Path(file_path)
         self.lock_file = self.file_path.with_suffix('.lock')
+        self.wal_file = self.file_path.with_suffix('.wal.jsonl')
+
+        # (data, {task_id: (column, index)}) for the last data read/written
+        self._id_index = (None, {})
+
+        # WAL state: last sequence number handed out, entries not yet
+        # compacted into the YAML, pending compaction timer
+        self._wal_lock = threading.Lock()
+        self._wal_seq = 0
+        self._wal_pending = 0
+        self._compact_timer = None
+        self._flush_threshold = COMPACT_THRESHOLD
+        # _stat_key() right after this process's last write; anything else
+        # means another process wrote since (resync the sequence)
+        self._own_stat_key = None
+
+        # Parsed board for an unchanged YAML + WAL (see _stat_key)
+        self._cache_lock = threading.Lock()
+        self._cache = None
+        self._cache_key = None
+
+        # Digest of the last board written (updatedAt aside) and the YAML's
+        # stat right after, to skip rewriting an unchanged board
+        self._written_digest = None
+        self._written_stat = None
 
         # Ensure file exists
         if not self.file_path.exists():
             self.file_path.parent.mkdir(parents=True, exist_ok=True)
             self._initialize_file()
 
+        # Lock file opened once. flock locks belong to the open file, not
+        # the thread, so threads of this process also take _thread_lock
+        self._lock_fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        self._thread_lock = threading.Lock()
+
+        # Pick up the sequence and compact anything left by a previous run
+        self.compact()
+        atexit.register(self.flush)
+
     def _initialize_file(self):
         """Initialize empty backlog.yaml"""
         initial_data = {
@@ -26,68 +106,435 @@ class TaskFileManager:
             'inProgress': [],
             'blocked': [],
             'done': [],
+            'next_id': 1,
             'flushThreshold': 10,
             'pendingChanges': 0,
             'updatedAt': time.strftime('%Y-%m-%d'),
             'updatedBy': '@agent'
         }
-        self.file_path.write_text(yaml.dump(initial_data))
+        self.file_path.write_bytes(yaml.dump(
+            initial_data,
+            Dumper=_Dumper,
+            default_flow_style=False,
+            allow_unicode=True,
+            sort_keys=False,
+            encoding='utf-8'
+        ))
+
+    def next_task_id(self, data):
+        """
+        Allocate the next task ID (T001, T002, ...) from data['next_id']
+
+        The counter is persisted by the 'create' delta (or the next
+        write_tasks(data)). Files
+        written before the counter existed are scanned once to seed it.
+        IDs already on the board (agents add tasks to backlog.yaml by
+        hand, with explicit IDs) are skipped.
+        New tasks get their ID from append_delta('create', None, ...),
+        which calls this under the write lock.
+        """
+        next_num = data.get('next_id')
+        if not next_num:
+            # One pass, no intermediate list
+            next_num = 1 + max((
+                int(t['id'][1:])
+                for column in TASK_COLUMNS
+                for t in data.get(column) or ()
+                if isinstance(t.get('id'), str) and t['id'].startswith('T') and t['id'][1:].isdigit()
+            ), default=0)
+
+        indexed_data, index = self._id_index
+        if indexed_data is not data:
+            index = self._index(data)
+        while f"T{next_num:03d}" in index:
+            next_num += 1
+
+        data['next_id'] = next_num + 1
+        return f"T{next_num:03d}"
+
+    @contextmanager
+    def _write_lock(self):
+        """Exclusive lock against other writers, in this and other processes"""
+        with self._thread_lock:
+            self._flock_exclusive()
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _flock_exclusive(self):
+        """LOCK_EX on backlog.lock: spin, then back off, never block in the kernel"""
+        attempt = 0
+        while True:
+            try:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                pass
+            if attempt < LOCK_SPINS:
+                os.sched_yield()
+            else:
+                time.sleep(min(0.001 * (1 << min(attempt - LOCK_SPINS, 6)), LOCK_MAX_SLEEP))
+            attempt += 1
+
+    def close(self):
+        """Write pending changes and release the lock file"""
+        atexit.unregister(self.flush)
+        self.flush()
+        os.close(self._lock_fd)
+
+    def _index(self, data):
+        """Build and remember the id -> (column, index) map for data"""
+        index = {}
+        for column in TASK_COLUMNS:
+            for i, t in enumerate(data.get(column) or []):
+                index.setdefault(t.get('id'), (column, i))
+        self._id_index = (data, index)
+        return index
+
+    def find_task(self, data, task_id, columns=TASK_COLUMNS):
+        """
+        Find a task by ID in data (as returned by read_tasks)
+
+        Returns: (task, column), or (None, None) if not in columns
+        """
+        indexed_data, index = self._id_index
+        if indexed_data is not data:
+            index = self._index(data)
+
+        column, i = index.get(task_id, (None, None))
+        tasks = data.get(column) or []
+        if column is not None and (i >= len(tasks) or tasks[i].get('id') != task_id):
+            # data was modified since it was indexed
+            column, i = self._index(data).get(task_id, (None, None))
+
+        if column is None or column not in columns:
+            return None, None
+        return data[column][i], column
+
+    def _apply_delta(self, data, entry):
+        """Apply one WAL entry to data"""
+        op = entry['op']
+        task_id = entry['id']
+
+        if op == 'create':
+            # Entries already in the YAML were skipped by walSeq, so an
+            # existing ID is a task added by hand meanwhile, unless the
+            # YAML lost its walSeq and holds this very task
+            data['next_id'] = max(data.get('next_id') or 1, entry.get('next_id') or 1)
+            new_task = entry['patch']
+            task, _ = self.find_task(data, task_id)
+            if task is not None and data.get('walSeq') is None and task == new_task:
+                return
+            if task is not None:
+                task_id = self.next_task_id(data)
+                logger.warning(
+                    "WAL create %d: %s is already taken on the board, keeping the task as %s",
+                    entry['seq'], entry['id'], task_id
+                )
+                new_task = {**new_task, 'id': task_id}
+
+            backlog = data.setdefault('backlog', [])
+            backlog.append(new_task)
+            self._id_index[1][task_id] = ('backlog', len(backlog) - 1)
+
+        elif op == 'update':
+            task, column = self.find_task(data, task_id)
+            if not task:
+                return
+            task.update(entry['patch'])
+
+            move_to = entry.get('move_to')
+            if move_to and move_to != column:
+                data[column] = [t for t in data[column] if t.get('id') != task_id]
+                data.setdefault(move_to, []).append(task)
+
+    def _read_board(self, track_wal=False):
+        """
+        Read YAML and replay uncompacted WAL entries
+
+        The WAL is read first: if a compaction lands in between, the new
+        YAML already contains those entries (skipped by walSeq); reading
+        the YAML first could pair the old YAML with a truncated WAL.
+
+        track_wal: update the WAL sequence/pending counters (write lock held)
+        """
+        try:
+            wal_lines = self.wal_file.read_bytes().splitlines()
+        except FileNotFoundError:
+            wal_lines = []
+
+        # Bytes straight to the loader: libyaml decodes the UTF-8 itself
+        data = yaml.load(self.file_path.read_bytes(), Loader=_Loader) or {}
+
+        applied_seq = data.get('walSeq') or 0
+        last_seq = applied_seq
+        pending = 0
+        for line in wal_lines:
+            try:
+                entry = orjson.loads(line)
+            except ValueError:
+                break  # torn last line (crash or append in progress)
+            if entry['seq'] <= applied_seq:
+                continue
+            self._apply_delta(data, entry)
+            last_seq = entry['seq']
+            pending += 1
+
+        # Everything up to last_seq is applied to data; changes not yet in
+        # backlog.yaml (the UI can show this)
+        data['walSeq'] = last_seq
+        data['pendingChanges'] = pending
+        self._flush_threshold = data.get('flushThreshold') or COMPACT_THRESHOLD
 
-    def read_tasks(self):
-        """Read tasks with shared lock (multiple readers OK)"""
+        if track_wal:
+            with self._wal_lock:
+                self._wal_seq = max(self._wal_seq, last_seq)
+                self._wal_pending = pending
+
+        self._index(data)
+        return data
+
+    def _write_locked(self, data):
+        """Write data (with all WAL entries applied) to YAML, truncate WAL (lock held)"""
+        with self._wal_lock:
+            data['walSeq'] = self._wal_seq
+            self._wal_pending = 0
+        data['pendingChanges'] = 0
+
+        # Same board as our last write and the file untouched since: skip
+        # the dump, the fsync and the watcher wakeup a rewrite would cause
+        digest = hashlib.blake2b(orjson.dumps(
+            {k: v for k, v in data.items() if k != 'updatedAt'},
+            default=str, option=orjson.OPT_NON_STR_KEYS
+        ), digest_size=16).digest()
+        if digest == self._written_digest and self._yaml_stat() == self._written_stat:
+            self._index(data)
+            return
+
+        # Update timestamp
+        data['updatedAt'] = time.strftime('%Y-%m-%d %H:%M:%S')
+
+        self._replace_file(data)
+        self._invalidate_cache()
+        self._index(data)
+        self._written_digest = digest
+        self._written_stat = self._yaml_stat()
+
+        # Everything up to walSeq is in the YAML now
+        if self.wal_file.exists():
+            os.truncate(self.wal_file, 0)
+        self._own_stat_key = self._stat_key()
+
+    def _replace_file(self, data):
+        """
+        Atomically replace backlog.yaml with data dumped as YAML
+
+        On Linux the YAML goes to an unnamed O_TMPFILE first and only
+        gets a name once complete and fsync'd, so a crash never leaves a
+        partial .tmp behind. Elsewhere (or if the filesystem / /proc
+        doesn't support it) a named temp file is written and renamed.
+        """
+        temp_file = self.file_path.with_suffix('.tmp')
+
+        fd = None
+        if hasattr(os, 'O_TMPFILE'):
+            try:
+                fd = os.open(self.file_path.parent, os.O_TMPFILE | os.O_WRONLY, 0o644)
+            except OSError:
+                pass
+
+        if fd is not None:
+            try:
+                self._dump_to_fd(fd, data)
+                try:
+                    os.unlink(temp_file)
+                except FileNotFoundError:
+                    pass
+                # linkat(AT_SYMLINK_FOLLOW) through /proc gives it a name
+                os.link(f'/proc/self/fd/{fd}', temp_file)
+                os.replace(temp_file, self.file_path)
+                return
+            except OSError:
+                pass  # named temp file below
+            finally:
+                os.close(fd)
+
+        fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            self._dump_to_fd(fd, data)
+        finally:
+            os.close(fd)
+        os.replace(temp_file, self.file_path)
+
+    @staticmethod
+    def _dump_to_fd(fd, data):
+        """Emit data as YAML straight into fd (no in-memory copy) and fsync"""
+        with os.fdopen(fd, 'wb', closefd=False) as f:
+            yaml.dump(
+                data,
+                f,
+                Dumper=_Dumper,
+                default_flow_style=False,
+                allow_unicode=True,
+                sort_keys=False,
+                encoding='utf-8'
+            )
+        os.fsync(fd)
+
+    def append_delta(self, op, task_id, patch, **extra):
+        """
+        Log a mutation ('create' or 'update') to the WAL
+
+        One fsync'd line per change; backlog.yaml is rewritten once the
+        board's flushThreshold changes are pending, or COMPACT_DELAY
+        after the first one, whichever comes first.
+
+        A 'create' with task_id None is given the next ID (set in patch).
+
+        Returns: task_id
+        """
+        with self._write_lock():
+            allocate = op == 'create' and task_id is None
+            if allocate or self._stat_key() != self._own_stat_key:
+                board = self._read_cached(readonly=True)
+                # Another process may have logged/compacted meanwhile: our
+                # entry must sort after everything already in the files
+                with self._wal_lock:
+                    self._wal_seq = max(self._wal_seq, board['walSeq'])
+                    self._wal_pending = board['pendingChanges']
+
+            if allocate:
+                # Allocated from the board as of now, under the lock, so
+                # concurrent creates (any thread or process) never collide
+                board = dict(board)
+                task_id = self.next_task_id(board)
+                patch['id'] = task_id
+                extra['next_id'] = board['next_id']
+
+            with self._wal_lock:
+                self._wal_seq += 1
+                self._wal_pending += 1
+                entry = {'seq': self._wal_seq, 'op': op, 'id': task_id, 'patch': patch, **extra}
+                pending = self._wal_pending
+
+            fd = os.open(self.wal_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, orjson.dumps(entry) + b'\n')
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self._invalidate_cache()
+            self._own_stat_key = self._stat_key()
+
+        if pending >= self._flush_threshold:
+            logger.info("flushThreshold reached (%d pending changes), writing backlog.yaml", pending)
+            self.compact()
+        else:
+            self._schedule_compaction()
+
+        return task_id
+
+    def _schedule_compaction(self):
+        """Start the compaction timer unless one is already pending"""
+        with self._wal_lock:
+            if self._compact_timer is not None:
+                return
+            self._compact_timer = threading.Timer(COMPACT_DELAY, self.compact)
+            self._compact_timer.daemon = True
+            self._compact_timer.start()
+
+    def compact(self):
+        """Fold the WAL into backlog.yaml and truncate it"""
+        with self._wal_lock:
+            if self._compact_timer is not None:
+                self._compact_timer.cancel()
+                self._compact_timer = None
+
+        with self._write_lock():
+            data = self._read_board(track_wal=True)
+            if self._wal_pending:
+                self._write_locked(data)
+
+    def flush(self):
+        """Write pending changes to backlog.yaml now (e.g. on shutdown)"""
+        self.compact()
+
+    def _yaml_stat(self):
+        st = os.stat(self.file_path)
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _stat_key(self):
+        """
+        (inode, mtime_ns, size) of the YAML and the WAL; changes on any write
+
+        The inode catches a rename-replace within the mtime granularity.
+        """
+        yaml_stat = os.stat(self.file_path, follow_symlinks=False)
+        try:
+            wal_stat = os.stat(self.wal_file, follow_symlinks=False)
+            wal_key = (wal_stat.st_ino, wal_stat.st_mtime_ns, wal_stat.st_size)
+        except FileNotFoundError:
+            wal_key = None
+        return (yaml_stat.st_ino, yaml_stat.st_mtime_ns, yaml_stat.st_size, wal_key)
+
+    def _invalidate_cache(self):
+        with self._cache_lock:
+            self._cache_key = None
+            self._cache = None
+
+    def _read_cached(self, readonly=False):
+        """_read_board, skipping the read and parse if nothing changed"""
+        key = self._stat_key()
+        with self._cache_lock:
+            if key == self._cache_key:
+                if readonly:
+                    return MappingProxyType(self._cache)
+                # Callers mutate what they get back
+                data = copy.deepcopy(self._cache)
+                self._index(data)
+                return data
+
+        data = self._read_board()
+        cached = data if readonly else copy.deepcopy(data)
+        with self._cache_lock:
+            self._cache = cached
+            self._cache_key = key
+        return MappingProxyType(cached) if readonly else data
+
+    def read_tasks(self, readonly=False):
+        """
+        Read tasks (no lock: writers replace the YAML atomically)
+
+        readonly=True returns a read-only view of the cached board instead
+        of a copy; nothing in it (task lists included) may be modified.
+        """
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                with self.lock_file.open('a') as lock:
-                    # Shared lock - multiple readers allowed
-                    fcntl.flock(lock.fileno(), fcntl.LOCK_SH)
-                    try:
-                        text = self.file_path.read_text(encoding='utf-8')
-                        data = yaml.safe_load(text) or {}
-                        return data
-                    finally:
-                        fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
-            except BlockingIOError:
-                # Lock is held, wait and retry
-                time.sleep(0.1 * (attempt + 1))
+                return self._read_cached(readonly)
             except Exception as e:
+                # e.g. FileNotFoundError in a rename window, or a YAML
+                # being rewritten in place by an editor
                 if attempt == max_retries - 1:
                     raise
                 time.sleep(0.1 * (attempt + 1))
 
-        raise TimeoutError("Could not acquire read lock after retries")
-
     def write_tasks(self, data):
-        """Write tasks with exclusive lock (single writer)"""
+        """
+        Write tasks with exclusive lock (single writer)
+
+        data must come from read_tasks (WAL already applied); the WAL is
+        truncated.
+        """
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                with self.lock_file.open('a') as lock:
-                    # Exclusive lock - only one writer, blocks readers
-                    fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
-                    try:
-                        # Update timestamp
-                        data['updatedAt'] = time.strftime('%Y-%m-%d %H:%M:%S')
-
-                        # Write to temp file first (atomic write)
-                        temp_file = self.file_path.with_suffix('.tmp')
-                        yaml_content = yaml.dump(
-                            data,
-                            default_flow_style=False,
-                            allow_unicode=True,
-                            sort_keys=False,
-                            encoding='utf-8'
-                        ).decode('utf-8')
-                        temp_file.write_text(yaml_content, encoding='utf-8')
-
-                        # Atomic replace
-                        temp_file.replace(self.file_path)
-                    finally:
-                        fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+                # Exclusive lock - only one writer
+                with self._write_lock():
+                    self._write_locked(data)
 
                 return True
-            except BlockingIOError:
-                time.sleep(0.1 * (attempt + 1))
             except Exception as e:
                 if attempt == max_retries - 1:
                     raise
@@ -1,70 +1,96 @@
 """
 SSE Manager - Server-Sent Events for real-time updates
 """
-import json
-import queue
+import orjson
+import threading
 import time
+from collections import deque
+from file_manager import json_default
+
+HEARTBEAT_INTERVAL = 30  # seconds without output before a heartbeat
+# Comment frame: browsers ignore lines starting with ':', so this only
+# keeps the connection alive
+HEARTBEAT = ": keepalive\n\n"
+
+
+def _dumps(obj):
+    # YAML can yield dates and non-string keys; boards may be read-only views
+    return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS).decode()
 
 
 class SSEManager:
     """Manages Server-Sent Events for real-time client updates"""
 
     def __init__(self):
-        self.clients = []
+        # (deque, Event) per client, keyed by id() for O(1) add/remove;
+        # _clients_lock guards every access (request, watcher and
+        # compaction threads all touch it)
+        self.clients = {}
+        self._clients_lock = threading.Lock()
 
-    def add_client(self, q):
+    def add_client(self, client):
         """Add a new SSE client"""
-        self.clients.append(q)
+        with self._clients_lock:
+            self.clients[id(client)] = client
 
-    def remove_client(self, q):
+    def remove_client(self, client):
         """Remove disconnected client"""
-        if q in self.clients:
-            self.clients.remove(q)
+        with self._clients_lock:
+            self.clients.pop(id(client), None)
 
     def notify_all(self, event_type, data):
-        """Notify all connected clients of an event"""
-        dead_clients = []
-
-        for q in self.clients:
-            try:
-                q.put({
-                    'event': event_type,
-                    'data': data,
-                    'timestamp': time.time()
-                }, timeout=1)
-            except (queue.Full, Exception):
-                # Client is dead or slow
-                dead_clients.append(q)
-
-        # Clean up dead clients
-        for q in dead_clients:
-            self.remove_client(q)
+        """
+        Notify all connected clients of an event
+
+        Never blocks: each client has a bounded deque, and a slow client
+        loses its oldest frames instead of stalling the broadcast.
+        """
+        # Format the frame once; every client gets the same string
+        frame = f"event: {event_type}\ndata: {_dumps(data)}\n\n"
+
+        # Snapshot under the lock, deliver outside it so registrations
+        # never wait on a broadcast
+        with self._clients_lock:
+            clients = list(self.clients.values())
+
+        for frames, wakeup in clients:
+            frames.append(frame)  # maxlen: drops the oldest when full
+            wakeup.set()
 
     def stream(self):
         """SSE generator function"""
-        q = queue.Queue(maxsize=50)
-        self.add_client(q)
+        frames = deque(maxlen=50)
+        wakeup = threading.Event()
+        client = (frames, wakeup)
+        self.add_client(client)
 
         try:
             # Send initial heartbeat
-            yield f"event: connected\ndata: {json.dumps({'status': 'connected'})}\n\n"
+            yield f"event: connected\ndata: {_dumps({'status': 'connected'})}\n\n"
+            last_sent = time.monotonic()
 
             while True:
-                try:
-                    # Wait for message or heartbeat
-                    msg = q.get(timeout=30)
-
-                    event = msg.get('event', 'message')
-                    data = msg.get('data', {})
-
-                    yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+                # Wait for message or heartbeat; monotonic, so wakeups
+                # without frames and clock jumps don't shift the cadence
+                remaining = HEARTBEAT_INTERVAL - (time.monotonic() - last_sent)
+                if remaining <= 0 or not wakeup.wait(timeout=remaining):
+                    yield HEARTBEAT
+                    last_sent = time.monotonic()
+                    continue
 
-                except queue.Empty:
-                    # Send heartbeat to keep connection alive
-                    yield f"event: heartbeat\ndata: {json.dumps({'ping': time.time()})}\n\n"
+                # Clear before draining: a frame appended meanwhile
+                # sets the event again instead of being missed
+                wakeup.clear()
+                if frames:
+                    # One write for a whole burst
+                    batch = []
+                    while frames:
+                        batch.append(frames.popleft())
+                    yield ''.join(batch)
+                    last_sent = time.monotonic()
 
         except GeneratorExit:
             # Client disconnected
             pass
         finally:
-            self.remove_client(q)
+            self.remove_client(client)
@@ -1,19 +1,45 @@
 """
 File Watcher - Monitor backlog.yaml for changes
+
+On Linux, inotify on the parent directory (close-after-write and
+rename-into events, filtered by file name); elsewhere, watchdog.
 """
 import threading
 from pathlib import Path
 from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
 
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # not Linux / not installed: watchdog
+    INotify = None
+
 
 class BacklogFileHandler(FileSystemEventHandler):
-    """Handler for backlog.yaml file changes"""
+    """
+    Handler for backlog.yaml file changes
+
+    Trailing-edge debounce: every event re-arms one timer, so a burst
+    (editor save, temp file + rename) invokes callback once, after the
+    last event.
+    """
 
-    def __init__(self, file_path, callback):
+    def __init__(self, file_path, callback, debounce=0.3):
         self.file_path = Path(file_path)
+        self._resolved = self.file_path.resolve()  # fixed; resolve once
         self.callback = callback
-        self.last_modified = 0
+        self._debounce = debounce
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def _schedule(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self._debounce, self.callback)
+            self._timer.daemon = True
+            self._timer.start()
 
     def on_modified(self, event):
         """Called when file is modified"""
@@ -21,22 +47,59 @@ class BacklogFileHandler(FileSystemEventHandler):
             return
 
         # Check if it's our file
-        if Path(event.src_path).resolve() == self.file_path.resolve():
-            import time
-            current_time = time.time()
+        if Path(event.src_path).resolve() == self._resolved:
+            self._schedule()
+
+    def on_moved(self, event):
+        """Called on rename; atomic writes rename a temp file onto ours"""
+        if event.is_directory:
+            return
+
+        if Path(event.dest_path).resolve() == self._resolved:
+            self._schedule()
+
 
-            # Debounce (avoid duplicate events)
-            if current_time - self.last_modified > 0.5:
-                self.last_modified = current_time
-                self.callback()
+def _inotify_loop(inotify, file_name, event_handler):
+    """Dispatch inotify events for file_name (name compare, no syscalls)"""
+    while True:
+        # Waits in poll(), which gevent makes cooperative when patched
+        for event in inotify.read():
+            if event.name == file_name:
+                event_handler._schedule()
 
 
-def start_file_watcher(file_path, callback):
-    """Start watching file for changes"""
+def start_file_watcher(file_path, callback, polling=False, debounce=0.3):
+    """
+    Start watching file for changes (callback runs once per burst)
+
+    polling=True makes the watchdog fallback stat the directory instead
+    of blocking on OS events (needed under gevent, where a blocking read
+    stalls every greenlet).
+    """
     file_path = Path(file_path)
 
-    event_handler = BacklogFileHandler(file_path, callback)
-    observer = Observer()
+    event_handler = BacklogFileHandler(file_path, callback, debounce)
+
+    if INotify is not None:
+        try:
+            inotify = INotify()
+            # The directory watch survives the file being replaced by rename
+            inotify.add_watch(
+                str(file_path.parent),
+                inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO
+            )
+        except OSError:
+            pass  # e.g. inotify watch limit reached: watchdog below
+        else:
+            watcher_thread = threading.Thread(
+                target=_inotify_loop,
+                args=(inotify, file_path.name, event_handler),
+                daemon=True
+            )
+            watcher_thread.start()
+            return inotify
+
+    observer = PollingObserver(timeout=0.5) if polling else Observer()
     observer.schedule(event_handler, str(file_path.parent), recursive=False)
 
     # Start in background thread